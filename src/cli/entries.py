@@ -169,7 +169,7 @@ def main(  # pylint: disable=too-many-arguments
         with open(
             out_dir / Path(configuration_file.stem + ".md"), "w", encoding="utf-8"
         ) as md_file:
-            md_file.writelines(markdown_results)
+            md_file.write(markdown_results)
 
     if html:
         resource_file_dir = importlib.resources.files("cli")
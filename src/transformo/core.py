@@ -6,6 +6,9 @@ These are the basic building blocks of the Transformo system.
 
 from __future__ import annotations
 
+import copy
+import json
+import weakref
 from abc import abstractmethod
 from typing import TYPE_CHECKING, Any, Iterable, Literal
 
@@ -13,7 +16,7 @@ import numpy as np
 import pydantic
 
 from transformo._typing import CoordinateMatrix
-from transformo.datatypes import Coordinate, Parameter
+from transformo.datatypes import Coordinate, CoordinateBatch, Parameter
 
 
 @pydantic.dataclasses.dataclass()
@@ -50,6 +53,15 @@ class CoordinateOverrides:
     )
 
 
+# Registry of all known DataSource classes, keyed by their fully qualified name.
+# Subclasses of DataSource are registered when they are defined, see
+# DataSource.__init_subclass__() below. Like `__subclasses__()` the registry only
+# holds weak references, so classes that go out of scope are not kept alive.
+_DATASOURCE_REGISTRY: weakref.WeakValueDictionary[str, type[DataSource]] = (
+    weakref.WeakValueDictionary()
+)
+
+
 class DataSource(pydantic.BaseModel):
     """Base class for any Transformo data source."""
 
@@ -133,6 +145,7 @@ class DataSource(pydantic.BaseModel):
     # trickery is needed. See the final lines of DataSource.__init__() above.
 
     def __init_subclass__(cls, **kwargs):
+        _DATASOURCE_REGISTRY[f"{cls.__module__}.{cls.__qualname__}"] = cls
 
         def init_decorator(previous_init):
             def new_init(self, *args, **kwargs):
@@ -213,7 +226,7 @@ class DataSource(pydantic.BaseModel):
                 if (t := self.overrides[key].t) is not None:
                     c.t = t
 
-            self.coordinates = sorted(self.coordinates, key=lambda c: c.station)
+        self.coordinates = sorted(self.coordinates, key=lambda c: c.station)
 
     def __add__(self, other: DataSource) -> DataSource:
         """
@@ -237,6 +250,25 @@ class DataSource(pydantic.BaseModel):
         # at this point both DataSources contain valid data and we can combine them
         return CombinedDataSource(self, other)
 
+    @classmethod
+    def concat(cls, sources: Iterable[DataSource]) -> DataSource:
+        """
+        Combine any number of `DataSource`s.
+
+        Gives the same result as adding the `DataSource`s together, but the
+        coordinates of all the `DataSource`s are joined in one go instead of
+        creating an intermediate `CombinedDataSource` for each addition.
+        """
+        non_empty_sources = [source for source in sources if source.coordinates]
+
+        if not non_empty_sources:
+            return DataSource(None)
+
+        if len(non_empty_sources) == 1:
+            return non_empty_sources[0]
+
+        return CombinedDataSource(*non_empty_sources)
+
     def __hash__(self) -> int:
         """
         Hash of the DataSource.
@@ -255,26 +287,31 @@ class DataSource(pydantic.BaseModel):
         This classmethod supports pydantic in dynamically creating a valid model
         for the Pipeline class when serialising the pipeline from an external
         configuration file.
+
+        Subclasses are registered in a registry as they are defined, so no
+        traversal of the class hierarchy is needed.
         """
         # the parent class "datasource" is needed in the list as well, since
         # DataSource's can be instantiated as well as classes inheriting from it
-        subclasses = [DataSource] + list(cls.__subclasses__())
-
-        # we want to find all levels of subclasses, not just the first level
-        for subclass in cls.__subclasses__():
-            subclasses.extend(subclass.get_subclasses())
-
-        return tuple(set(subclasses))
+        return (DataSource,) + tuple(
+            subclass
+            for subclass in _DATASOURCE_REGISTRY.values()
+            if issubclass(subclass, cls) and subclass is not cls
+        )
 
     @property
     def coordinate_matrix(self) -> CoordinateMatrix:
         """
         The coordinates in matrix form.
         """
-        # Understably, pylint doesn't recognize pydantic.Field as an Iteralble
-        return np.array(
-            [c.vector for c in self.coordinates]  # pylint: disable=not-an-iterable
-        )
+        return self.coordinate_batch.as_matrix()
+
+    @property
+    def coordinate_batch(self) -> CoordinateBatch:
+        """
+        The coordinates as a `CoordinateBatch`, i.e. one array per coordinate element.
+        """
+        return CoordinateBatch.from_coordinates(self.coordinates)
 
     @property
     def weights_matrix(self) -> CoordinateMatrix:
@@ -290,10 +327,7 @@ class DataSource(pydantic.BaseModel):
             weight = (1 / stddev**2) * station_weight
         """
 
-        # Coordinate.weights() does the heavy lifting, here we just reorder the data
-        return np.array(
-            [c.weights for c in self.coordinates]  # pylint: disable=not-an-iterable
-        )
+        return self.coordinate_batch.weights()
 
     @property
     def stations(self) -> list[str]:
@@ -318,22 +352,28 @@ class DataSource(pydantic.BaseModel):
         if len(old_coordinates) != coordinates.shape[0]:
             raise ValueError("Incorrect number of coordinates!")
 
+        # The spatial elements are the only new values. Validating them in one go
+        # replaces the validation of Coordinate, which rejects inf and NaN, for
+        # instance when PROJ fails to transform a coordinate.
+        if not np.isfinite(coordinates[:, 0:3]).all():
+            raise ValueError("Coordinates must be finite!")
+
+        # The remaining elements of the old coordinates have already been
+        # validated when they were read, so instead of instantiating (and
+        # validating) new Coordinate's we make shallow copies and update the
+        # spatial elements. `tolist()` ensures that the coordinate elements
+        # stay Python floats.
         new_coordinates: list[Coordinate] = []
-        for i, coord in enumerate(old_coordinates):
-            coord = Coordinate(
-                station=coord.station,
-                t=coord.t,
-                x=coordinates[i, 0],
-                y=coordinates[i, 1],
-                z=coordinates[i, 2],
-                sx=coord.sx,
-                sy=coord.sy,
-                sz=coord.sz,
-                w=coord.w,
-            )
-            new_coordinates.append(coord)
-
-        return DataSource(coordinates=new_coordinates)
+        for coord, (x, y, z) in zip(old_coordinates, coordinates[:, 0:3].tolist()):
+            new_coord = copy.copy(coord)
+            new_coord.x = x
+            new_coord.y = y
+            new_coord.z = z
+            new_coordinates.append(new_coord)
+
+        # The new coordinates are already validated and in order, so validation
+        # and post initialization of the new DataSource can safely be skipped
+        return DataSource.model_construct(coordinates=new_coordinates)
 
     def station_union(self, other: DataSource) -> list[str]:
         return list(set(self.stations) & set(other.stations))
@@ -364,12 +404,12 @@ class CombinedDataSource(DataSource):
     else:
         type: Literal["combined_datasource"] = "combined_datasource"
 
-    def __init__(self, first: DataSource, second: DataSource, **kwargs) -> None:
+    def __init__(self, *sources: DataSource, **kwargs) -> None:
         """Set up base reader."""
-        coordinates = first.coordinates + second.coordinates
+        coordinates = [c for source in sources for c in source.coordinates]
         super().__init__(coordinates=coordinates, **kwargs)
 
-        self._origins: list[DataSource] = [first, second]
+        self._origins: list[DataSource] = list(sources)
 
     @property
     def origins(self) -> list[DataSource]:
@@ -381,6 +421,15 @@ class CombinedDataSource(DataSource):
         return list(set(l))
 
 
+# Registry of all known Operator classes, keyed by their fully qualified name.
+# Subclasses of Operator are registered when they are defined, see
+# Operator.__init_subclass__() below. Like `__subclasses__()` the registry only
+# holds weak references, so classes that go out of scope are not kept alive.
+_OPERATOR_REGISTRY: weakref.WeakValueDictionary[str, type[Operator]] = (
+    weakref.WeakValueDictionary()
+)
+
+
 class Operator(pydantic.BaseModel):
     """
     Base Operator class.
@@ -425,6 +474,10 @@ class Operator(pydantic.BaseModel):
 
         self._transformation_parameters_given: bool = False
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _OPERATOR_REGISTRY[f"{cls.__module__}.{cls.__qualname__}"] = cls
+
     def __repr__(self) -> str:
         """ """
         params = ", ".join(f"{p.name}: {p.value}" for p in self.parameters)
@@ -438,16 +491,17 @@ class Operator(pydantic.BaseModel):
         This classmethod supports pydantic in dynamically creating a valid model
         for the Pipeline class when serialising the pipeline from an external
         configuration file.
+
+        Subclasses are registered in a registry as they are defined, so no
+        traversal of the class hierarchy is needed.
         """
         # the parent class "operator" is needed in the list as well, since
-        # DataSource's can be instantiated as well as classes inheriting from it
-        subclasses = [Operator] + list(cls.__subclasses__())
-
-        # we want to find all levels of subclasses, not just the first level
-        for subclass in cls.__subclasses__():
-            subclasses.extend(subclass.get_subclasses())
-
-        return tuple(set(subclasses))
+        # Operator's can be instantiated as well as classes inheriting from it
+        return (Operator,) + tuple(
+            subclass
+            for subclass in _OPERATOR_REGISTRY.values()
+            if issubclass(subclass, cls) and subclass is not cls
+        )
 
     @abstractmethod
     def _proj_name(self) -> str:
@@ -491,6 +545,16 @@ class Operator(pydantic.BaseModel):
         """
         return self._proj_name()
 
+    @property
+    def is_noop(self) -> bool:
+        """
+        Determine if the `Operator` leaves coordinates unchanged.
+
+        An `Operator` that corresponds to PROJ's "noop" operation doesn't alter
+        coordinates, so there is no need to call its `forward()` method.
+        """
+        return self.proj_operation_name == "noop"
+
     @property
     def parameters(self) -> list[Parameter]:
         """
@@ -512,17 +576,27 @@ class Operator(pydantic.BaseModel):
         return self._parameter_list()
 
     @abstractmethod
-    def forward(self, coordinates: CoordinateMatrix) -> CoordinateMatrix:
+    def forward(
+        self, coordinates: CoordinateMatrix, out: CoordinateMatrix | None = None
+    ) -> CoordinateMatrix:
         """
         Forward method of the Operator.
 
+        If `out` is given, the results are written to it and `out` is returned.
+        This allows callers to reuse an already allocated matrix. `out` must
+        have the same shape as `coordinates` and may be `coordinates` itself.
+
         Abstract. Needs to be implemented by inheriting classes.
         """
 
-    def inverse(self, coordinates: CoordinateMatrix) -> CoordinateMatrix:
+    def inverse(
+        self, coordinates: CoordinateMatrix, out: CoordinateMatrix | None = None
+    ) -> CoordinateMatrix:
         """
         Inverse method of the Operator.
 
+        See `forward()` for a description of `out`.
+
         Abstract. Can be implemented by inheriting classes.
         """
         raise NotImplementedError
@@ -542,6 +616,15 @@ class Operator(pydantic.BaseModel):
         raise NotImplementedError
 
 
+# Registry of all known Presenter classes, keyed by their fully qualified name.
+# Subclasses of Presenter are registered when they are defined, see
+# Presenter.__init_subclass__() below. Like `__subclasses__()` the registry only
+# holds weak references, so classes that go out of scope are not kept alive.
+_PRESENTER_REGISTRY: weakref.WeakValueDictionary[str, type[Presenter]] = (
+    weakref.WeakValueDictionary()
+)
+
+
 class Presenter(pydantic.BaseModel):
     """Base Presenter class."""
 
@@ -566,6 +649,10 @@ class Presenter(pydantic.BaseModel):
         """Set up base presenter."""
         super().__init__(name=name, **kwargs)
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _PRESENTER_REGISTRY[f"{cls.__module__}.{cls.__qualname__}"] = cls
+
     @classmethod
     def get_subclasses(cls) -> Iterable[type[Presenter]]:
         """
@@ -574,16 +661,17 @@ class Presenter(pydantic.BaseModel):
         This classmethod supports pydantic in dynamically creating a valid model
         for the `Pipeline` class when serialising the pipeline from an external
         configuration file.
+
+        Subclasses are registered in a registry as they are defined, so no
+        traversal of the class hierarchy is needed.
         """
         # the parent class "presenter" is needed in the list as well, since
-        # DataSource's can be instantiated as well as classes inheriting from it
-        subclasses = [Presenter] + list(cls.__subclasses__())
-
-        # we want to find all levels of subclasses, not just the first level
-        for subclass in cls.__subclasses__():
-            subclasses.extend(subclass.get_subclasses())
-
-        return tuple(set(subclasses))
+        # Presenter's can be instantiated as well as classes inheriting from it
+        return (Presenter,) + tuple(
+            subclass
+            for subclass in _PRESENTER_REGISTRY.values()
+            if issubclass(subclass, cls) and subclass is not cls
+        )
 
     @abstractmethod
     def evaluate(
@@ -604,6 +692,19 @@ class Presenter(pydantic.BaseModel):
         Present results as JSON.
         """
 
+    def as_jsonable(self) -> Any:
+        """
+        Present results as Python objects that can be serialized to JSON.
+
+        Serializing the returned data gives the same JSON as `as_json()`. This
+        allows results of several `Presenter`s to be combined in one JSON
+        document without parsing the output of `as_json()`.
+
+        Presenters are encouraged to override this method and return their
+        data directly, the default implementation parses `as_json()`.
+        """
+        return json.loads(self.as_json())
+
     @abstractmethod
     def as_markdown(self) -> str:
         """
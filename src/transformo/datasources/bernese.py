@@ -9,6 +9,7 @@ References:
 from __future__ import annotations
 
 import os
+import sys
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Literal
@@ -85,7 +86,7 @@ def crd_line_to_coordinate(line: str) -> CrdCoordinate:
         case _:
             raise ValueError
 
-    return CrdCoordinate(station, flag, float(x), float(y), float(z))
+    return CrdCoordinate(sys.intern(station), flag, float(x), float(y), float(z))
 
 
 class BerneseCrdDataSource(DataSource):
@@ -5,6 +5,7 @@ The CSV DataSource for Transformo.
 import csv
 import enum
 import os
+import sys
 from typing import Literal
 
 import pydantic
@@ -60,7 +61,7 @@ def _dict_to_coordinate(d: dict[str, str]) -> Coordinate:
         weight = float(d["weight"])
 
     return Coordinate(
-        station=d["station"],
+        station=sys.intern(d["station"]),
         t=t,
         x=float(d["x"]),
         y=float(d["y"]),
@@ -4,11 +4,20 @@ Fundamental datatypes to Transformo.
 
 from __future__ import annotations
 
+import sys
+from typing import Iterable, Sequence
+
 import numpy as np
 import pydantic
 from pydantic.dataclasses import dataclass
 
-from transformo._typing import CoordinateVector, ParameterValue
+from transformo._typing import (
+    CoordinateMatrix,
+    CoordinateVector,
+    Matrix,
+    ParameterValue,
+    Vector,
+)
 from transformo.transformer import Transformer
 
 
@@ -51,6 +60,12 @@ class Coordinate:  # pylint: disable=too-many-instance-attributes
         w: str = "1.0",
     ) -> Coordinate:
         """ "Instantiate a coordinate from string values"""
+        # Station names are repeated across many coordinates, interning them
+        # means that only one copy of each name is kept in memory. Non-string
+        # station names are left for pydantic to reject.
+        if isinstance(station, str):
+            station = sys.intern(station)
+
         return Coordinate(
             station=station,
             t=float(t),
@@ -65,15 +80,20 @@ class Coordinate:  # pylint: disable=too-many-instance-attributes
 
     @property
     def vector(self) -> CoordinateVector:
-        """Coordinate given as Numpy vector (1D array)."""
-        return np.array([self.x, self.y, self.z, self.t])
+        """
+        Coordinate given as Numpy vector (1D array).
+
+        A missing timestamp is represented by NaN.
+        """
+        t = np.nan if self.t is None else self.t
+        return np.array((self.x, self.y, self.z, t), dtype=np.float64)
 
     @property
     def stddev(self) -> np.typing.ArrayLike:
         """
         Coordinate standard deviations gives as a Numpy vector (1D array).
         """
-        return np.array([self.sx, self.sy, self.sz])
+        return np.array((self.sx, self.sy, self.sz), dtype=np.float64)
 
     @property
     def weights(self) -> np.typing.ArrayLike:
@@ -88,9 +108,10 @@ class Coordinate:  # pylint: disable=too-many-instance-attributes
         # Deal with zero-divisions. If a coordinate value has an uncertainty of 0
         # it is generally understood to be a defining coordinate, i.e. it has no
         # uncertainty. That can lead to various numerical issues, so we replace the
-        # zeroes with a value very close to zero.
+        # zeroes with a value very close to zero. Standard deviations are never
+        # negative so a simple clamp to the minimum value does the job.
         epsilon = 1e-15
-        non_zero_stddev = np.where(self.stddev == 0, epsilon, self.stddev)
+        non_zero_stddev = np.maximum(self.stddev, epsilon)
 
         weights = np.divide(1, np.square(non_zero_stddev))
 
@@ -110,31 +131,153 @@ class Coordinate:  # pylint: disable=too-many-instance-attributes
         if transformer:
             lon, lat, h = transformer.transform_one(np.array([lon, lat, h]))
 
-        feat: dict = {
-            "type": "Feature",
-            "properties": {
-                "station": self.station,
-            },
-            "geometry": {
-                "type": "Point",
-                "coordinates": [
-                    lon,
-                    lat,
-                ],
-            },
-        }
+        feat = _geojson_point_feature(self.station, lon, lat)
 
         if properties:
-            feat["properties"] = feat["properties"] | properties
+            feat["properties"].update(properties)
 
         return feat
 
+    @classmethod
+    def geojson_features(
+        cls, coordinates: Sequence[Coordinate], transformer: Transformer | None = None
+    ) -> list[dict]:
+        """
+        Return basic GeoJSON features for a list of coordinates.
+
+        Equivalent to calling `geojson_feature()` on each coordinate, except that
+        all coordinates are transformed in one go when a `transformer` is given.
+        """
+        if not coordinates:
+            return []
+
+        positions: Matrix = np.array(
+            [(c.x, c.y, c.z) for c in coordinates], dtype=np.float64
+        )
+        if transformer:
+            positions = transformer.transform_many(positions)
+
+        return [
+            _geojson_point_feature(c.station, lon, lat)
+            for c, (lon, lat, _) in zip(coordinates, positions.tolist())
+        ]
+
+
+def _geojson_point_feature(station: str, lon: float, lat: float) -> dict:
+    """Create a GeoJSON point feature with the station name as a property."""
+    return {
+        "type": "Feature",
+        "properties": {
+            "station": station,
+        },
+        "geometry": {
+            "type": "Point",
+            "coordinates": [
+                lon,
+                lat,
+            ],
+        },
+    }
+
+
+class CoordinateBatch:
+    """
+    A batch of coordinates stored as one array per coordinate element.
+
+    Where a list of `Coordinate`s stores the elements of each coordinate
+    together, a `CoordinateBatch` stores each element of all the coordinates
+    together in a contiguous 1D array. This makes operations on a single
+    coordinate element, for instance a mean of the x-components, cheap.
+
+    Missing timestamps are represented by NaN's in `t`.
+    """
+
+    __slots__ = ("x", "y", "z", "t", "sx", "sy", "sz", "w")
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        x: Vector,
+        y: Vector,
+        z: Vector,
+        t: Vector,
+        sx: Vector,
+        sy: Vector,
+        sz: Vector,
+        w: Vector,
+    ) -> None:
+        self.x = x
+        self.y = y
+        self.z = z
+        self.t = t
+        self.sx = sx
+        self.sy = sy
+        self.sz = sz
+        self.w = w
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    @classmethod
+    def from_coordinates(cls, coordinates: Sequence[Coordinate]) -> CoordinateBatch:
+        """
+        Create a `CoordinateBatch` from a list of `Coordinate`s.
+        """
+        n = len(coordinates)
+
+        def element(values: Iterable[float]) -> Vector:
+            return np.fromiter(values, dtype=np.float64, count=n)
+
+        return CoordinateBatch(
+            x=element(c.x for c in coordinates),
+            y=element(c.y for c in coordinates),
+            z=element(c.z for c in coordinates),
+            t=element(np.nan if c.t is None else c.t for c in coordinates),
+            sx=element(c.sx for c in coordinates),
+            sy=element(c.sy for c in coordinates),
+            sz=element(c.sz for c in coordinates),
+            w=element(c.w for c in coordinates),
+        )
+
+    def as_matrix(self) -> CoordinateMatrix:
+        """
+        The coordinates in matrix form, with one coordinate per row.
+
+        Columns are ordered as x, y, z and t. This is the layout used by
+        `Operator`s.
+        """
+        return np.stack((self.x, self.y, self.z, self.t), axis=1)
+
+    def stddev(self) -> CoordinateMatrix:
+        """
+        Standard deviations of the coordinates as a Nx3 matrix.
+        """
+        return np.stack((self.sx, self.sy, self.sz), axis=1)
+
+    def weights(self) -> CoordinateMatrix:
+        """
+        Weights of the coordinates as a Nx3 matrix.
+
+        Weights are calculated for all coordinates at once, in the same way as
+        `Coordinate.weights`.
+        """
+        stddev = self.stddev()
+
+        # See Coordinate.weights for a note on zero-valued standard deviations
+        epsilon = 1e-15
+        non_zero_stddev = np.maximum(stddev, epsilon)
+
+        weights = np.divide(1, np.square(non_zero_stddev))
+
+        return np.multiply(weights, self.w[:, np.newaxis])
+
 
 class Parameter:
     """
     Transformation parameters for use in `Operator`s.
     """
 
+    __slots__ = ("name", "value", "_is_flag", "_proj_param")
+
     name: str
     value: ParameterValue
 
@@ -142,6 +285,14 @@ class Parameter:
         self.name = name.lstrip("+")
         self.value = value
 
+        # Parameters are generally not modified after creation, so the
+        # PROJ representation is determined once and for all here
+        self._is_flag = value is None
+        if self._is_flag:
+            self._proj_param = f"+{self.name}"
+        else:
+            self._proj_param = f"+{self.name}={self.value}"
+
     def __eq__(self, other) -> bool:
         """Compare two Parameters"""
         return self.name == other.name and self.value == other.value
@@ -165,14 +316,11 @@ class Parameter:
         A flag can be regarded as an on/off switch. If it's there it means that some
         condition is true.
         """
-        return self.value is None
+        return self._is_flag
 
     @property
     def as_proj_param(self) -> str:
         """
         Get the parameter in PROJ string representation.
         """
-        if self.is_flag:
-            return f"+{self.name}"
-
-        return f"+{self.name}={self.value}"
+        return self._proj_param
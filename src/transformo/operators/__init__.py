@@ -6,6 +6,8 @@ from __future__ import annotations
 
 from typing import Literal
 
+import numpy as np
+
 from transformo._typing import CoordinateMatrix
 from transformo.core import Operator
 from transformo.datatypes import Parameter
@@ -47,20 +49,28 @@ class DummyOperator(Operator):
     ) -> None:
         """This does absolutely nothing. Yes, it's dumb."""
 
-    def forward(self, coordinates: CoordinateMatrix) -> CoordinateMatrix:
+    def forward(
+        self, coordinates: CoordinateMatrix, out: CoordinateMatrix | None = None
+    ) -> CoordinateMatrix:
         """
         Forward method of the Transformation.
 
         It simply returns the same coordinates as it receives.
         That's how dumb this operation is!
         """
-        return coordinates
+        if out is None:
+            return coordinates
+
+        np.copyto(out, coordinates)
+        return out
 
-    def inverse(self, coordinates: CoordinateMatrix) -> CoordinateMatrix:
+    def inverse(
+        self, coordinates: CoordinateMatrix, out: CoordinateMatrix | None = None
+    ) -> CoordinateMatrix:
         """
         Inverse method of the Transformation.
 
         It simply returns the same coordinates as it receives.
         That really is how dumb this operation is!
         """
-        return coordinates
+        return self.forward(coordinates, out=out)
@@ -6,7 +6,6 @@ from __future__ import annotations
 
 import enum
 import math
-from functools import cached_property
 from typing import TYPE_CHECKING, Any, Literal, Optional
 
 import numpy as np
@@ -17,27 +16,73 @@ from transformo.core import Operator
 from transformo.datatypes import Parameter
 
 
-# MyPy acts up a bit when encountering class variables that are Optional.
-# When we have a pydantic.BaseModel with a class variable such as
-#
-#    x: Optional[float] = float("nan")
-#
-# MyPy will think of it having type "float | None", which is likely correct
-# but a bit of a pain, since many functions that work on floats have their
-# input types set to "float". MyPy will complain when the class variable is
-# passed to `float()` etc. By wrapping these functions with a guard for None
-# MyPy accepts input of type "float | None" since they effective strip the None
-# part of the variables typing information.
-def _isnan(f: float | None) -> bool:
-    if f is None:
-        f = float("nan")
-    return math.isnan(f)
+def _is_set(value: float | None) -> bool:
+    """
+    Has a parameter been given a value?
+
+    None and NaN both mean that a parameter is not set. NaN is detected by
+    it being the only value that is not equal to itself.
+    """
+    # pylint: disable-next=comparison-with-itself
+    return value is not None and value == value
+
+
+def _output_matrix(
+    coordinates: CoordinateMatrix, out: CoordinateMatrix | None
+) -> CoordinateMatrix:
+    """
+    Prepare the matrix that a Helmert operation writes its results to.
+
+    If `out` is None a new matrix is allocated, otherwise `out` is used, which
+    allows callers to reuse a preallocated matrix across calls. `out` can be
+    `coordinates` itself, in which case the coordinates are transformed in place.
+
+    Only the columns that are not touched by the Helmert operation, e.g. the
+    timestamps, are copied to the output matrix. The spatial components are
+    left for the caller to write, so they are only passed over once.
+    """
+    if out is None:
+        out = np.empty_like(coordinates)
+
+    if out is not coordinates:
+        out[:, 3:] = coordinates[:, 3:]
+
+    return out
+
+
+def _match_precision(values: Matrix, coordinates: CoordinateMatrix) -> Matrix:
+    """
+    Cast transformation parameters to single precision for single precision input.
+
+    Mixing double precision parameters with single precision coordinates
+    makes NumPy compute in double precision and cast the results back, which
+    doubles the memory traffic for no gain in accuracy of the output.
+    """
+    if coordinates.dtype == np.float32:
+        return values.astype(np.float32)
+
+    return values
+
+
+def _weighted_mean(
+    values: CoordinateMatrix, weights: CoordinateMatrix | None
+) -> Vector:
+    """
+    Column-wise weighted mean of `values`.
+
+    Equivalent to `np.average(values, axis=0, weights=weights)` but the
+    weighted sums are computed in a single pass without allocating a
+    temporary matrix of weighted values. If `weights` is None a plain mean
+    is returned.
+    """
+    if weights is None:
+        return np.mean(values, axis=0)
 
+    weight_sums = np.sum(weights, axis=0)
+    if np.any(weight_sums == 0.0):
+        raise ZeroDivisionError("Weights sum to zero, can't be normalized")
 
-def _float(f: float | None) -> float:
-    if f is None:
-        f = float("nan")
-    return float(f)
+    return np.einsum("ij,ij->j", values, weights) / weight_sums
 
 
 class HelmertTranslation(Operator):
@@ -55,10 +100,10 @@ class HelmertTranslation(Operator):
 
     type: Literal["helmert_translation"] = "helmert_translation"
 
-    # Parameters
-    x: Optional[float] = float("nan")
-    y: Optional[float] = float("nan")
-    z: Optional[float] = float("nan")
+    # Parameters - None means that the parameter was not given
+    x: Optional[float] = None
+    y: Optional[float] = None
+    z: Optional[float] = None
 
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
@@ -68,6 +113,7 @@ class HelmertTranslation(Operator):
 
         self._sanitize_parameters()
         # ... from now on we can rely on parameters being useful
+        self._update_derived_parameters()
 
     def _has_transformation_parameters_been_given(self):
         """
@@ -77,22 +123,22 @@ class HelmertTranslation(Operator):
         inheriting from HelmertTranslation.
         """
         # if one or more parameter is given at instantiation time
-        if not _isnan(self.x) or not _isnan(self.y) or not _isnan(self.z):
+        if any(_is_set(p) for p in (self.x, self.y, self.z)):
             self._transformation_parameters_given = True
 
     def _sanitize_parameters(self) -> None:
-        """Make sure that translation parameters are not None."""
-        if _isnan(self.x):
+        """Make sure that translation parameters are not None or NaN."""
+        if not _is_set(self.x):
             self.x = 0.0
 
-        if _isnan(self.y):
+        if not _is_set(self.y):
             self.y = 0.0
 
-        if _isnan(self.z):
+        if not _is_set(self.z):
             self.z = 0.0
 
     def _proj_name(self) -> str:
-        if not self.parameters:
+        if not (self.x or self.y or self.z):
             # In principle PROJ will accept a "+proj=helmert" string without
             # parameters, but this will be slightly faster and communicate
             # better that nothing is done
@@ -102,66 +148,88 @@ class HelmertTranslation(Operator):
 
     def _parameter_list(self) -> list[Parameter]:
         params: list[Parameter] = []
-        if not _isnan(self.x) and self.x != 0.0:
-            params.append(Parameter("x", _float(self.x)))
+        if self.x:
+            params.append(Parameter("x", self.x))
 
-        if not _isnan(self.y) and self.y != 0.0:
-            params.append(Parameter("y", _float(self.y)))
+        if self.y:
+            params.append(Parameter("y", self.y))
 
-        if not _isnan(self.z) and self.z != 0.0:
-            params.append(Parameter("z", _float(self.z)))
+        if self.z:
+            params.append(Parameter("z", self.z))
 
         return params
 
+    def _update_derived_parameters(self) -> None:
+        """
+        Update values that are derived from the transformation parameters.
+
+        Called at the end of instantiation. Must be called again whenever the
+        parameters are changed, e.g. after they have been estimated.
+        """
+        self._T = np.array((self.x, self.y, self.z), dtype=np.float64)
+
     @property
     def T(self) -> Vector:  # pylint: disable=invalid-name
         """
         The translation parameters as a vector.
         """
-        return np.array(
-            [
-                self.x,
-                self.y,
-                self.z,
-            ]
-        )
+        return self._T
 
-    def forward(self, coordinates: CoordinateMatrix) -> CoordinateMatrix:
+    def forward(
+        self, coordinates: CoordinateMatrix, out: CoordinateMatrix | None = None
+    ) -> CoordinateMatrix:
         """
         Forward method of the 3 parameter Helmert.
+
+        The result is written to `out` if it is given, otherwise a new matrix
+        is allocated. See `_output_matrix()`.
         """
-        coords = coordinates.copy()
-        coords[:, 0:3] = coords[:, 0:3] + self.T
+        # Like the DummyOperator a translation of zero passes the input
+        # coordinates through untouched, unless they have to be written to `out`
+        if self.is_noop and (out is None or out is coordinates):
+            return coordinates
+
+        # Adding directly into the output avoids a temporary matrix for the sum
+        coords = _output_matrix(coordinates, out)
+        T = _match_precision(self.T, coordinates)
+        np.add(coordinates[:, 0:3], T, out=coords[:, 0:3])
         return coords
 
-    def inverse(self, coordinates: CoordinateMatrix) -> CoordinateMatrix:
+    def inverse(
+        self, coordinates: CoordinateMatrix, out: CoordinateMatrix | None = None
+    ) -> CoordinateMatrix:
         """
         Inverse method of the 3 parameter Helmert.
+
+        The result is written to `out` if it is given, otherwise a new matrix
+        is allocated. See `_output_matrix()`.
         """
-        coords = coordinates.copy()
-        coords[:, 0:3] = coords[:, 0:3] - self.T
+        if self.is_noop and (out is None or out is coordinates):
+            return coordinates
+
+        coords = _output_matrix(coordinates, out)
+        T = _match_precision(self.T, coordinates)
+        np.subtract(coordinates[:, 0:3], T, out=coords[:, 0:3])
         return coords
 
     def estimate(
         self,
         source_coordinates: CoordinateMatrix,
         target_coordinates: CoordinateMatrix,
-        source_weights: CoordinateMatrix,
-        target_weights: CoordinateMatrix,
+        source_weights: CoordinateMatrix | None,
+        target_weights: CoordinateMatrix | None,
     ) -> None:
         """
         Estimate parameters.
 
         Parameters `x`, `y` and `z` of this operator *will* be overwritten once
         this method is called.
+
+        If weights are None, the coordinates are weighted equally.
         """
 
-        avg_source = np.average(
-            source_coordinates[:, 0:3], axis=0, weights=source_weights
-        )
-        avg_target = np.average(
-            target_coordinates[:, 0:3], axis=0, weights=target_weights
-        )
+        avg_source = _weighted_mean(source_coordinates[:, 0:3], source_weights)
+        avg_target = _weighted_mean(target_coordinates[:, 0:3], target_weights)
 
         mean_translation = avg_target - avg_source
 
@@ -169,6 +237,8 @@ class HelmertTranslation(Operator):
         self.y = mean_translation[1]
         self.z = mean_translation[2]
 
+        self._update_derived_parameters()
+
 
 class RotationConvention(enum.Enum):
     """
@@ -209,6 +279,26 @@ def R3(rz: float) -> Matrix:
             [      0,        0, 1],
         ]
     )
+
+
+def R321(rx: float, ry: float, rz: float) -> Matrix:
+    """
+    Rotation matrix for rotating about the x-, y- and z-axis, in that order.
+
+    Equivalent to `R3(rz) @ R2(ry) @ R1(rx)` but computed directly from the
+    closed-form expression of the combined rotation.
+    """
+    c1, s1 = math.cos(rx), math.sin(rx)
+    c2, s2 = math.cos(ry), math.sin(ry)
+    c3, s3 = math.cos(rz), math.sin(rz)
+
+    return np.array(
+        [
+            [c3*c2, c3*s2*s1 - s3*c1, c3*s2*c1 + s3*s1],
+            [s3*c2, s3*s2*s1 + c3*c1, s3*s2*c1 - c3*s1],
+            [  -s2,            c2*s1,            c2*c1],
+        ]
+    )
 # fmt: on
 
 
@@ -241,61 +331,58 @@ class Helmert7Param(HelmertTranslation):
     small_angle_approximation: bool = True
 
     # Rotation parameters - given in arc seconds
-    rx: Optional[float] = float("nan")
-    ry: Optional[float] = float("nan")
-    rz: Optional[float] = float("nan")
+    rx: Optional[float] = None
+    ry: Optional[float] = None
+    rz: Optional[float] = None
 
     # Scale parameter - given in ppm
-    s: Optional[float] = float("nan")
+    s: Optional[float] = None
 
     def __init__(self, convention: RotationConvention, **kwargs) -> None:
         super().__init__(convention=convention, **kwargs)
 
     def _has_transformation_parameters_been_given(self):
         # if one or more parameter is given at instantiation time
-        parameters_instantiated = [
-            not _isnan(self.x),
-            not _isnan(self.y),
-            not _isnan(self.z),
-            not _isnan(self.rx),
-            not _isnan(self.ry),
-            not _isnan(self.rz),
-            not _isnan(self.s),
-        ]
+        parameters = (self.x, self.y, self.z, self.rx, self.ry, self.rz, self.s)
 
-        if any(parameters_instantiated):
+        if any(_is_set(p) for p in parameters):
             self._transformation_parameters_given = True
 
     def _sanitize_parameters(self) -> None:
-        """Make sure that translation parameters are not None."""
+        """Make sure that rotation and scale parameters are not None or NaN."""
         super()._sanitize_parameters()
 
-        if _isnan(self.rx):
+        if not _is_set(self.rx):
             self.rx = 0.0
 
-        if _isnan(self.ry):
+        if not _is_set(self.ry):
             self.ry = 0.0
 
-        if _isnan(self.rz):
+        if not _is_set(self.rz):
             self.rz = 0.0
 
-        if _isnan(self.s):
+        if not _is_set(self.s):
             self.s = 0.0
 
+    def _proj_name(self) -> str:
+        # The rotation convention is always part of the parameters,
+        # so this is never a "noop" operation
+        return "helmert"
+
     def _parameter_list(self) -> list[Parameter]:
         params: list[Parameter] = super()._parameter_list()
 
-        if not _isnan(self.rx) and self.rx != 0.0:
-            params.append(Parameter("rx", _float(self.rx)))
+        if self.rx:
+            params.append(Parameter("rx", self.rx))
 
-        if not _isnan(self.ry) and self.ry != 0.0:
-            params.append(Parameter("ry", _float(self.ry)))
+        if self.ry:
+            params.append(Parameter("ry", self.ry))
 
-        if not _isnan(self.rz) and self.rz != 0.0:
-            params.append(Parameter("rz", _float(self.rz)))
+        if self.rz:
+            params.append(Parameter("rz", self.rz))
 
-        if not _isnan(self.s) and self.s != 0.0:
-            params.append(Parameter("s", _float(self.s)))
+        if self.s:
+            params.append(Parameter("s", self.s))
 
         params.append(Parameter("convention", self.convention.value))
         if self.small_angle_approximation:
@@ -303,19 +390,30 @@ class Helmert7Param(HelmertTranslation):
 
         return params
 
-    @cached_property
-    def R(self) -> Matrix:  # pylint: disable=invalid-name
-        """
-        Rotation matrix.
-        """
+    def _update_derived_parameters(self) -> None:
+        super()._update_derived_parameters()
+
+        def arcsec2rad(arcsec: float | None) -> float:
+            # rotations are never None after sanitization, but mypy can't know that
+            return math.radians(arcsec or 0.0) / 3600.0
 
-        def arcsec2rad(arcsec) -> float:
-            return np.deg2rad(arcsec) / 3600.0
+        rx, ry, rz = arcsec2rad(self.rx), arcsec2rad(self.ry), arcsec2rad(self.rz)
 
-        rx = arcsec2rad(self.rx)
-        ry = arcsec2rad(self.ry)
-        rz = arcsec2rad(self.rz)
+        self._scale = 1.0 if self.s is None else 1 + self.s * 1e-6
+        self._R = self._rotation_matrix(rx, ry, rz)
 
+        # Without rotations the transformation reduces to a scaling and a
+        # translation, and the matrix multiplication can be skipped.
+        self._has_rotation = bool(rx or ry or rz)
+
+        # Scaled rotation matrices used in forward() and inverse()
+        self._forward_matrix = np.ascontiguousarray(self._scale * self._R.T)
+        self._inverse_matrix = np.ascontiguousarray(1 / self._scale * self._R)
+
+    def _rotation_matrix(self, rx: float, ry: float, rz: float) -> Matrix:
+        """
+        Construct the rotation matrix from rotations given in radians.
+        """
         if self.small_angle_approximation:
             rotation_matrix = np.array(
                 [
@@ -325,7 +423,7 @@ class Helmert7Param(HelmertTranslation):
                 ]
             )
         else:
-            rotation_matrix = R3(rz) @ R2(ry) @ R1(rx)
+            rotation_matrix = R321(rx, ry, rz)
 
         if self.convention == RotationConvention.POSITION_VECTOR:
             return rotation_matrix
@@ -334,82 +432,171 @@ class Helmert7Param(HelmertTranslation):
         # "coordinate frame" which we get by transposing the rotation matrix
         return rotation_matrix.T
 
+    @property
+    def R(self) -> Matrix:  # pylint: disable=invalid-name
+        """
+        Rotation matrix.
+        """
+        return self._R
+
     @property
     def scale(self) -> float:
         """Scale parameter"""
-        if self.s is None:
-            return 1
-        return 1 + self.s * 1e-6
+        return self._scale
 
-    def forward(self, coordinates: CoordinateMatrix) -> CoordinateMatrix:
+    def forward(
+        self, coordinates: CoordinateMatrix, out: CoordinateMatrix | None = None
+    ) -> CoordinateMatrix:
         """
         Forward method of the 7 parameter Helmert.
+
+        The result is written to `out` if it is given, otherwise a new matrix
+        is allocated. See `_output_matrix()`.
         """
 
         # Since the coordinates are contained in a Nx3 matrix, we deviate
         # from the single-point Helmert formulation of B = T + s * R*A.
         # By transposing the rotation matrix we get the same results
         # when instead doing B = T + s * A*R^T.
-        coords = coordinates.copy()
-        coords[:, 0:3] = self.T + self.scale * coords[:, 0:3] @ self.R.T
+        #
+        # The scale is applied to the 3x3 rotation matrix rather than to the
+        # Nx3 coordinate matrix, and the results are written directly to the
+        # output matrix, which avoids temporary Nx3 matrices.
+        coords = _output_matrix(coordinates, out)
+        xyz = coords[:, 0:3]
+        if self._has_rotation:
+            M = _match_precision(self._forward_matrix, coordinates)
+            np.matmul(coordinates[:, 0:3], M, out=xyz)
+        else:
+            np.multiply(coordinates[:, 0:3], self.scale, out=xyz)
+        np.add(xyz, _match_precision(self.T, coordinates), out=xyz)
         return coords
 
-    def inverse(self, coordinates: CoordinateMatrix) -> CoordinateMatrix:
+    def inverse(
+        self, coordinates: CoordinateMatrix, out: CoordinateMatrix | None = None
+    ) -> CoordinateMatrix:
         """
         Inverse method of the 7 parameter Helmert.
+
+        The result is written to `out` if it is given, otherwise a new matrix
+        is allocated. See `_output_matrix()`.
         """
-        coords = coordinates.copy()
-        coords[:, 0:3] = -self.T + 1 / self.scale * coords[:, 0:3] @ self.R
+        coords = _output_matrix(coordinates, out)
+        xyz = coords[:, 0:3]
+        if self._has_rotation:
+            M = _match_precision(self._inverse_matrix, coordinates)
+            np.matmul(coordinates[:, 0:3], M, out=xyz)
+        else:
+            np.divide(coordinates[:, 0:3], self.scale, out=xyz)
+        np.subtract(xyz, _match_precision(self.T, coordinates), out=xyz)
 
         return coords
 
+    def compose(self, other: Helmert7Param) -> Helmert7Param:
+        """
+        Combine this and another 7 parameter Helmert into a single operator.
+
+        The returned operator is equivalent to first applying this operator and
+        then `other`. Combining the parameters of the two gives
+
+            T = T2 + s2 * R2 * T1
+            R = R2 * R1
+            s = s2 * s1
+
+        The combined operator uses the rotation convention of this operator. It
+        uses the small angle approximation if both operators do, in which case
+        the result matches applying the two operators in sequence to within the
+        precision of the approximation.
+        """
+
+        def rad2arcsec(rad: float) -> float:
+            return math.degrees(rad) * 3600.0
+
+        translation = other.T + other.scale * other.R @ self.T
+        rotation = other.R @ self.R
+        scale = other.scale * self.scale
+
+        # The rotation matrix as it was before applying the rotation convention
+        if self.convention == RotationConvention.COORDINATE_FRAME:
+            rotation = rotation.T
+
+        small_angle_approximation = (
+            self.small_angle_approximation and other.small_angle_approximation
+        )
+        if small_angle_approximation:
+            # the rotations are found in the skew-symmetric part of the matrix
+            rx = (rotation[2, 1] - rotation[1, 2]) / 2
+            ry = (rotation[0, 2] - rotation[2, 0]) / 2
+            rz = (rotation[1, 0] - rotation[0, 1]) / 2
+        else:
+            # reverse the closed-form expression in R321()
+            rx = math.atan2(rotation[2, 1], rotation[2, 2])
+            ry = math.asin(-rotation[2, 0])
+            rz = math.atan2(rotation[1, 0], rotation[0, 0])
+
+        return Helmert7Param(
+            convention=self.convention,
+            small_angle_approximation=small_angle_approximation,
+            x=float(translation[0]),
+            y=float(translation[1]),
+            z=float(translation[2]),
+            rx=rad2arcsec(rx),
+            ry=rad2arcsec(ry),
+            rz=rad2arcsec(rz),
+            s=(scale - 1) * 1e6,
+        )
+
     def estimate(
         self,
         source_coordinates: CoordinateMatrix,
         target_coordinates: CoordinateMatrix,
-        source_weights: CoordinateMatrix,
-        target_weights: CoordinateMatrix,
+        source_weights: CoordinateMatrix | None,
+        target_weights: CoordinateMatrix | None,
     ) -> None:
         """
         Estimate parameters using small angle approximation.
+
+        If weights are None, the coordinates are weighted equally.
         """
 
         def rad2arcsec(rad) -> float:
             return np.rad2deg(rad) * 3600
 
-        # Build design matrix
+        # Build design matrix. The design matrix is set up as a (N, 3, 7) array,
+        # i.e. a 3x7 block per coordinate, which is flattened to (3N, 7) in the end.
         n = len(source_coordinates)
-        A = np.zeros((n * 3, 7))
-        for i, x in enumerate(source_coordinates):
-            # Note that the R components below appear to be the wrong rotation convention
-            # but when setting up the coeffecient matrix coeffecients have slightly different
-            # order, that ends up looking like the transposed rotation matrix.
-            if self.convention == RotationConvention.POSITION_VECTOR:
-                R = np.array(
-                    [
-                        [0, x[2], -x[1]],
-                        [-x[2], 0, x[0]],
-                        [x[1], -x[0], 0],
-                    ]
-                )
-            else:
-                R = np.array(
-                    [
-                        [0, -x[2], x[1]],
-                        [x[2], 0, -x[0]],
-                        [-x[1], x[0], 0],
-                    ]
-                )
-
-            A[i * 3 : i * 3 + 3, :] = np.column_stack([np.eye(3), x[0:3], R])
-
-        # Build weights matrix
-        W = np.eye(n * 3) * source_weights.flatten()
-
-        y = target_coordinates[:, 0:3].flatten()
-
-        # beta, _, _, _ = np.linalg.lstsq(A, b, rcond=None)
-        beta = np.linalg.inv(A.T @ W @ A) @ A.T @ W @ y
+        x = source_coordinates[:, 0]
+        y = source_coordinates[:, 1]
+        z = source_coordinates[:, 2]
+
+        # Note that the rotation components below appear to be the wrong rotation
+        # convention but when setting up the coeffecient matrix coeffecients have
+        # slightly different order, that ends up looking like the transposed
+        # rotation matrix. The "coordinate frame" rotation block is the
+        # transpose, and thus the negation, of the "position vector" block.
+        sign = 1.0 if self.convention == RotationConvention.POSITION_VECTOR else -1.0
+
+        blocks = np.zeros((n, 3, 7))
+        blocks[:, 0, 0] = blocks[:, 1, 1] = blocks[:, 2, 2] = 1.0
+        blocks[:, :, 3] = source_coordinates[:, 0:3]
+        blocks[:, 0, 5] = sign * z
+        blocks[:, 0, 6] = -sign * y
+        blocks[:, 1, 4] = -sign * z
+        blocks[:, 1, 6] = sign * x
+        blocks[:, 2, 4] = sign * y
+        blocks[:, 2, 5] = -sign * x
+        A = blocks.reshape(n * 3, 7)
+
+        b = target_coordinates[:, 0:3].flatten()
+
+        # Set up and solve the normal equations. The weight matrix is diagonal,
+        # so instead of building the dense 3Nx3N matrix the weights are applied
+        # directly to the columns of A^T, which gives A^T W.
+        if source_weights is None:
+            AtW = A.T
+        else:
+            AtW = A.T * source_weights[:, 0:3].flatten()
+        beta = np.linalg.solve(AtW @ A, AtW @ b)
 
         self.x = beta[0]
         self.y = beta[1]
@@ -421,3 +608,5 @@ class Helmert7Param(HelmertTranslation):
         self.rx = rad2arcsec(beta[4] / k)
         self.ry = rad2arcsec(beta[5] / k)
         self.rz = rad2arcsec(beta[6] / k)
+
+        self._update_derived_parameters()
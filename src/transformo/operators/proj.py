@@ -4,8 +4,11 @@ Operator(s) based on PROJ.
 
 from __future__ import annotations
 
+import functools
+import os
 import re
-from typing import Literal
+from concurrent.futures import ThreadPoolExecutor
+from typing import ClassVar, Literal
 
 import numpy as np
 import pyproj
@@ -16,6 +19,42 @@ from transformo.core import Operator
 from transformo.datatypes import Parameter
 
 
+@functools.lru_cache(maxsize=128)
+def _get_transformer(proj_string: str) -> pyproj.Transformer:
+    """
+    Create a PROJ transformer from a PROJ string.
+
+    Transformers are cached so that operators using the same PROJ string share
+    a transformer. This is safe since pyproj transformers are thread-safe.
+    """
+    return pyproj.Transformer.from_pipeline(proj_string)
+
+
+def _usable_cpu_count() -> int:
+    """
+    Number of CPUs the current process is allowed to run on.
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on all platforms, e.g. macOS and Windows
+        return os.cpu_count() or 1
+
+
+@functools.cache
+def _executor() -> ThreadPoolExecutor:
+    """
+    Thread pool used for transforming chunks of coordinates in parallel.
+
+    The pool is shared by all `ProjOperator`s and kept for the lifetime of the
+    process. pyproj sets up the PROJ objects of a transformer once in every
+    thread that uses it, so reusing the threads avoids initialising the PROJ
+    pipeline, and possibly loading grids, again on every transformation.
+    """
+    return ThreadPoolExecutor(
+        max_workers=_usable_cpu_count(), thread_name_prefix="transformo-proj"
+    )
+
+
 class ProjOperator(Operator):
     """
     Expose PROJ operations.
@@ -25,10 +64,16 @@ class ProjOperator(Operator):
 
     proj_string: str
 
+    # Number of coordinates passed to PROJ at a time. Large coordinate matrices
+    # are transformed in chunks to keep the working set small enough to fit
+    # in the CPU cache. When more than one chunk is needed the chunks are
+    # transformed in parallel, PROJ releases the GIL while transforming.
+    CHUNK_SIZE: ClassVar[int] = 65536
+
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
 
-        self._transformer = pyproj.Transformer.from_pipeline(self.proj_string)
+        self._transformer = _get_transformer(self.proj_string)
 
     def _parameter_list(self) -> list[Parameter]:
         params = []
@@ -41,33 +86,82 @@ class ProjOperator(Operator):
         return params
 
     def _proj_name(self) -> str:
-        matches = re.search(r"^\+?proj=([a-z]+) ", self.proj_string)
+        matches = re.search(r"^\+?proj=([a-z]+)(?:\s|$)", self.proj_string)
         assert matches is not None, "PROJ string is ill-formed"
 
         return matches.group(1)
 
-    def forward(self, coordinates: CoordinateMatrix) -> CoordinateMatrix:
+    def forward(
+        self, coordinates: CoordinateMatrix, out: CoordinateMatrix | None = None
+    ) -> CoordinateMatrix:
         """
         Forward method of the Transformation.
         """
-        x, y, z, t = self._transformer.transform(
-            coordinates[:, 0],
-            coordinates[:, 1],
-            coordinates[:, 2],
-            coordinates[:, 3],
-            direction=pyproj.enums.TransformDirection.FORWARD,
+        return self._transform(
+            coordinates, out, pyproj.enums.TransformDirection.FORWARD
         )
-        return np.array([x, y, z, t]).transpose()
 
-    def inverse(self, coordinates: CoordinateMatrix) -> CoordinateMatrix:
+    def inverse(
+        self, coordinates: CoordinateMatrix, out: CoordinateMatrix | None = None
+    ) -> CoordinateMatrix:
         """
         Inverse method of the Transformation.
         """
-        x, y, z, t = self._transformer.transform(
-            coordinates[:, 0],
-            coordinates[:, 1],
-            coordinates[:, 2],
-            coordinates[:, 3],
-            direction=pyproj.enums.TransformDirection.INVERSE,
+        return self._transform(
+            coordinates, out, pyproj.enums.TransformDirection.INVERSE
+        )
+
+    def _transform(
+        self,
+        coordinates: CoordinateMatrix,
+        out: CoordinateMatrix | None,
+        direction: pyproj.enums.TransformDirection,
+    ) -> CoordinateMatrix:
+        """
+        Transform coordinates in the given direction.
+
+        Results are written to `out` if given, otherwise a new matrix is created.
+
+        PROJ transforms the columns of the output matrix in place. A newly
+        created output matrix is stored in column-major order so that each
+        column is contiguous and can be handed directly to PROJ without
+        intermediate copies.
+        """
+        if out is None:
+            out = np.array(coordinates, dtype=np.float64, order="F")
+        elif out is not coordinates:
+            np.copyto(out, coordinates)
+
+        chunks = [
+            out[start : start + self.CHUNK_SIZE]
+            for start in range(0, out.shape[0], self.CHUNK_SIZE)
+        ]
+
+        if len(chunks) <= 1 or _usable_cpu_count() <= 1:
+            for chunk in chunks:
+                self._transform_chunk(chunk, direction)
+            return out
+
+        # pyproj transformers are thread-safe, so all threads share the same
+        # transformer. Chunks don't overlap so no further locking is needed.
+        # Consume the results to propagate any exceptions raised by PROJ.
+        list(_executor().map(self._transform_chunk, chunks, [direction] * len(chunks)))
+
+        return out
+
+    def _transform_chunk(
+        self, chunk: CoordinateMatrix, direction: pyproj.enums.TransformDirection
+    ) -> None:
+        """
+        Transform a chunk of the output matrix in place.
+        """
+        x, y, z, t = (chunk[:, i] for i in range(4))
+        results = self._transformer.transform(
+            x, y, z, t, direction=direction, inplace=True
         )
-        return np.array([x, y, z, t]).transpose()
+
+        # Columns that are not contiguous float64 arrays are copied by pyproj
+        # before transformation, in which case the results are copied back
+        for column, result in zip((x, y, z, t), results):
+            if result is not column:
+                column[:] = result
@@ -8,8 +8,9 @@ import asyncio
 import json
 import subprocess
 from datetime import datetime
-from typing import Annotated, Union
+from typing import Annotated, Sequence, Union, overload
 
+import numpy as np
 import pydantic
 import pydantic_yaml
 
@@ -78,8 +79,8 @@ class Pipeline(pydantic.BaseModel):
         )
 
         # set up combined datasources for both source and target data
-        self._combined_source_data = sum(self.source_data, DataSource(None))
-        self._combined_target_data = sum(self.target_data, DataSource(None))
+        self._combined_source_data = DataSource.concat(self.source_data)
+        self._combined_target_data = DataSource.concat(self.target_data)
 
         all_source_stations = self._combined_source_data.stations
         all_target_stations = self._combined_target_data.stations
@@ -104,7 +105,16 @@ class Pipeline(pydantic.BaseModel):
             msg = f"{n} stations removed from target data (not in intersection of source and target data)"
             logger.warning(msg)
 
-        self._intermediate_results: list[DataSource] = []
+        # The coordinate matrices are used repeatedly when processing the
+        # pipeline, so they are created once and for all here
+        self._source_coordinates = _combined_coordinate_matrix(self.source_data)
+        self._target_coordinates = _combined_coordinate_matrix(self.target_data)
+
+        # Coordinates resulting from each step of the pipeline. DataSource's are
+        # only created from them when the results of a step are requested
+        self._intermediate_coordinates: list[CoordinateMatrix] = []
+        self._intermediate_results: _StepResults | None = None
+        self._processed = False
 
     @classmethod
     def from_yaml(cls, yaml: str | bytes | bytearray) -> Pipeline:
@@ -134,7 +144,7 @@ class Pipeline(pydantic.BaseModel):
         return self._combined_target_data
 
     @property
-    def results(self) -> list[DataSource]:
+    def results(self) -> Sequence[DataSource]:
         """
         Return coordinate results, including intermediate steps.
 
@@ -143,8 +153,14 @@ class Pipeline(pydantic.BaseModel):
 
         TODO: Think of a better name.
         """
-        if len(self._intermediate_results) != len(self.operators):
+        if not self._processed:
             self.process()
+
+        if self._intermediate_results is None:
+            self._intermediate_results = _StepResults(
+                self.all_source_data, self._intermediate_coordinates
+            )
+
         return self._intermediate_results
 
     @property
@@ -152,45 +168,52 @@ class Pipeline(pydantic.BaseModel):
         """
         The combined set of source coordinates in matrix form.
         """
-        combined_datasource = self.source_data[0]
-        for datasource in self.source_data[1:]:
-            combined_datasource += datasource
-
-        return combined_datasource.coordinate_matrix
+        return self._source_coordinates
 
     @property
     def target_coordinates(self) -> CoordinateMatrix:
         """
         The combined set of target coordinates in matrix form.
         """
-        combined_datasource = self.target_data[0]
-        for datasource in self.target_data[1:]:
-            combined_datasource += datasource
-
-        return combined_datasource.coordinate_matrix
+        return self._target_coordinates
 
     def process(self) -> None:
         """
         Process all `Operator`s in the pipeline and pass the results to the
         `Presenter`s for evaluation.
+
+        The pipeline is only processed once, subsequent calls do nothing.
         """
+        if self._processed:
+            return
+
         for cmd in self.pre_processing_commands:
             transformo.run_command(cmd)
 
+        # start from scratch in case a previous attempt failed halfway through
+        self._intermediate_coordinates = []
+        self._intermediate_results = None
+
+        target_coordinates = self.target_coordinates
+        source_weights = self.all_source_data.weights_matrix
+        target_weights = self.all_target_data.weights_matrix
+
         current_step_coordinates = self.source_coordinates
         for operator in self.operators:
             if operator.can_estimate:
                 operator.estimate(
                     current_step_coordinates,
-                    self.target_coordinates,
-                    self.all_source_data.weights_matrix,
-                    self.all_target_data.weights_matrix,
+                    target_coordinates,
+                    source_weights,
+                    target_weights,
                 )
-            current_step_coordinates = operator.forward(current_step_coordinates)
-            current_step_datasource = self.all_source_data.update_coordinates(
-                current_step_coordinates
-            )
-            self._intermediate_results.append(current_step_datasource)
+
+            # the result of a noop is the same as the result of the previous step
+            if not operator.is_noop:
+                current_step_coordinates = operator.forward(current_step_coordinates)
+            self._intermediate_coordinates.append(current_step_coordinates)
+
+        self._processed = True
 
         for presenter in self.presenters:
             presenter.evaluate(
@@ -214,29 +237,84 @@ class Pipeline(pydantic.BaseModel):
         Return the results from the pipeline in markdown format,
         as specified with the given `Presenter`s.
         """
-        text = f"""
+        parts = [f"""
 # Transformo Results
 *Created with Transformo version {transformo.__version__}, {datetime.now()}*.\n
-""".lstrip()
+""".lstrip()]
 
         for presenter in self.presenters:
             section_header = presenter.presenter_name
             body = presenter.as_markdown()
 
-            text += f"## {section_header}\n\n"
-            text += f"{body}\n\n"
+            parts.append(f"## {section_header}\n\n{body}\n\n")
 
-        return text.rstrip()
+        return "".join(parts).rstrip()
 
     def results_as_json(self) -> str:
         """
         Return the results from the pipeline in JSON format,
         as specified with the given `Presenter`s.
 
-        Each `Presenter`
+        The results of each `Presenter` are found under the name of the `Presenter`.
         """
-        # There's a bit of back and forth between JSON representations here. It's
-        # not particularly efficient but it is easy and it allows the individual
-        # presentations to return a JSON string outside the context of a `Pipeline`.
-        data = {p.presenter_name: json.loads(p.as_json()) for p in self.presenters}
+        data = {p.presenter_name: p.as_jsonable() for p in self.presenters}
         return json.dumps(data)
+
+
+class _StepResults(Sequence[DataSource]):
+    """
+    Results of the steps of a pipeline.
+
+    Behaves as a read-only list of `DataSource`s. The `DataSource` of a step is
+    only created from the step's coordinates when it is accessed, so presenters
+    that don't look at the results don't pay for creating them.
+    """
+
+    def __init__(
+        self, datasource: DataSource, coordinates: list[CoordinateMatrix]
+    ) -> None:
+        self._datasource = datasource
+        self._coordinates = coordinates
+        self._results: list[DataSource | None] = [None] * len(coordinates)
+
+    def __len__(self) -> int:
+        return len(self._coordinates)
+
+    @overload
+    def __getitem__(self, index: int) -> DataSource: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[DataSource]: ...
+
+    def __getitem__(self, index: int | slice) -> DataSource | list[DataSource]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        result = self._results[index]
+        if result is None:
+            result = self._datasource.update_coordinates(self._coordinates[index])
+            self._results[index] = result
+
+        return result
+
+
+def _combined_coordinate_matrix(datasources: list[DataSource]) -> CoordinateMatrix:
+    """
+    The coordinates of several `DataSource`s combined in one matrix.
+
+    Equivalent to adding the `DataSource`s together and returning the
+    coordinate matrix of the result, i.e. coordinates are sorted by station
+    name. The matrices of the `DataSource`s are concatenated in one go rather
+    than creating intermediate `CombinedDataSource`s.
+    """
+    if len(datasources) == 0:
+        return np.empty((0, 4))
+
+    if len(datasources) == 1:
+        return datasources[0].coordinate_matrix
+
+    matrix = np.concatenate([ds.coordinate_matrix for ds in datasources])
+    stations = np.array([station for ds in datasources for station in ds.stations])
+
+    # a stable sort keeps the coordinates of a station in order of appearance
+    return matrix[np.argsort(stations, kind="stable")]
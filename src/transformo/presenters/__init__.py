@@ -6,8 +6,6 @@ from __future__ import annotations
 
 from typing import Literal
 
-from py_markdown_table.markdown_table import markdown_table
-
 from transformo.core import DataSource, Operator, Presenter
 
 
@@ -22,18 +20,32 @@ def construct_markdown_table(header: list[str], rows: list[list[str]]) -> str:
     table. The responsibility of how data is formatted is left to the
     caller.
 
+    Cells are padded so that the columns line up. Each column is wide enough
+    to hold its longest value with at least one space on either side, and
+    values are centered in their cells.
+
     Parameters:
         header: Titles for each column in the table
         rows:   Values of cells in table.
     """
-    data = [dict(zip(header, row)) for row in rows]
+    widths = [len(title) for title in header]
+    for row in rows:
+        widths = [max(width, len(cell) + 2) for width, cell in zip(widths, row)]
+
+    def format_row(cells: list[str]) -> str:
+        formatted = []
+        for cell, width in zip(cells, widths):
+            # any odd space left over goes to the right of the text
+            margin = width - len(cell)
+            left = margin // 2
+            formatted.append(" " * left + cell + " " * (margin - left))
+
+        return "|" + "|".join(formatted) + "|"
 
-    table = markdown_table(data)
-    table.set_params(
-        quote=False, padding_width=2, padding_weight="centerright", row_sep="markdown"
-    )
+    lines = [format_row(header), "|" + "|".join("-" * width for width in widths) + "|"]
+    lines.extend(format_row(row) for row in rows)
 
-    return table.get_markdown()
+    return "\n".join(lines)
 
 
 class DummyPresenter(Presenter):
@@ -60,6 +72,12 @@ class DummyPresenter(Presenter):
         """
         return "{}"
 
+    def as_jsonable(self) -> dict:
+        """
+        Present results as JSON-serializable data.
+        """
+        return {}
+
     def as_markdown(self) -> str:
         """
         Present result in the markdown text format.
@@ -11,11 +11,18 @@ from typing import Literal
 
 import numpy as np
 
+from transformo._typing import CoordinateMatrix, Matrix, Vector
 from transformo.core import DataSource, Operator, Presenter
+from transformo.datatypes import Coordinate
 from transformo.transformer import Transformer
 
 from . import construct_markdown_table
 
+# printf-style formats of the values in markdown tables. Residuals are given
+# with three significant figures, could potentially be an option.
+_COORDINATE_FORMAT = "%.4f"
+_RESIDUAL_FORMAT = "% -10.3g"
+
 
 def _raise_exception_if_file_cant_be_created(filename: pathlib.Path):
     """Throws a FileNotFoundError if the file can't be opened"""
@@ -29,6 +36,88 @@ def _raise_exception_if_file_cant_be_created(filename: pathlib.Path):
             filename.unlink()
 
 
+def _coordinates_by_station(
+    matrix: CoordinateMatrix, stations: list[str]
+) -> dict[str, list[float | None]]:
+    """
+    Coordinates as lists of x, y, z and t, keyed by station.
+
+    Missing timestamps are given as None.
+    """
+    rows = matrix.tolist()
+
+    # the coordinate matrix represents missing timestamps as NaN's
+    for i in np.flatnonzero(np.isnan(matrix[:, 3])):
+        rows[i][3] = None
+
+    return dict(zip(stations, rows))
+
+
+def _unique_station_rows(stations: list[str]) -> tuple[list[str], np.ndarray]:
+    """
+    Unique stations and the indices of the rows that represent them.
+
+    Stations may be repeated when data sources overlap. The result mirrors a
+    dict keyed by station: stations are ordered by their first occurrence and
+    the last occurrence of a station is the one that is used.
+    """
+    last_rows = {station: i for i, station in enumerate(stations)}
+    rows = np.fromiter(last_rows.values(), dtype=np.intp, count=len(last_rows))
+
+    return list(last_rows), rows
+
+
+def _formatted_rows(
+    keys: list[str], values: Matrix | None, fmt: str
+) -> list[list[str]]:
+    """
+    Table rows with a key followed by the formatted values of the matching row.
+
+    All values are formatted in one go.
+    """
+    if values is None:
+        return []
+
+    formatted = np.char.mod(fmt, values).tolist()
+
+    return [[key, *row] for key, row in zip(keys, formatted)]
+
+
+def _row_norms(matrix: Matrix) -> Vector:
+    """
+    Euclidean norms of the rows in `matrix`.
+    """
+    return np.sqrt(np.einsum("ij,ij->i", matrix, matrix))
+
+
+# Statistics of the residuals, in the order they are stored by the presenters
+_RESIDUAL_STATISTICS = ["avg", "std"]
+
+
+def _residual_statistics(residuals: Matrix) -> Matrix:
+    """
+    Average and standard deviation of each column in `residuals`.
+    """
+    return np.stack((np.mean(residuals, axis=0), np.std(residuals, axis=0)))
+
+
+def _residuals_as_jsonable(
+    stations: list[str], residuals: Matrix | None, stats: Matrix | None
+) -> dict:
+    """
+    Residuals keyed by station and their statistics keyed by measure.
+
+    An empty dict is returned if no residuals have been determined yet.
+    """
+    if residuals is None or stats is None:
+        return {}
+
+    return {
+        "residuals": dict(zip(stations, residuals.tolist())),
+        "stats": dict(zip(_RESIDUAL_STATISTICS, stats.tolist())),
+    }
+
+
 class CoordinateType(Enum):
     """
     Defines coordinate archetypes.
@@ -53,7 +142,20 @@ class CoordinatePresenter(Presenter):
         super().__init__(**kwargs)
 
         self._operator_titles: list[str] = []
-        self._steps: list[dict[str, list[float | None]]] = []
+
+        # Coordinates of the source data and the results of each step are
+        # stored in one (steps, stations, 4) array. The target data is kept
+        # separately, as it isn't guaranteed to contain the same stations.
+        # Repeated stations are only stored once.
+        self._stations: list[str] = []
+        self._coordinates: np.ndarray | None = None
+        self._target_stations: list[str] = []
+        self._target_coordinates: CoordinateMatrix | None = None
+
+        # JSON and markdown output is created on first request and reused
+        # until new results are evaluated
+        self._json_cache: str | None = None
+        self._markdown_cache: str | None = None
 
         if self.json_file:
             _raise_exception_if_file_cant_be_created(self.json_file)
@@ -81,14 +183,18 @@ class CoordinatePresenter(Presenter):
         This should hold true as long as `results` has it's origin in a
         Pipeline.
         """
-        steps = []
-        for ds in [source_data, *results, target_data]:
-            data = {}
-            for c in ds.coordinates:
-                data[c.station] = [c.x, c.y, c.z, c.t]
-            steps.append(data)
-
-        self._steps = steps
+        # new results make previously created output obsolete
+        self._json_cache = None
+        self._markdown_cache = None
+
+        # Given the assumptions above, the stations of each step are the same
+        # as those of the source data
+        self._stations, rows = _unique_station_rows(source_data.stations)
+        self._coordinates = np.stack(
+            [ds.coordinate_matrix[rows] for ds in [source_data, *results]]
+        )
+        self._target_stations, rows = _unique_station_rows(target_data.stations)
+        self._target_coordinates = target_data.coordinate_matrix[rows]
 
         operator_titles = []
         for operator in operators:
@@ -97,17 +203,45 @@ class CoordinatePresenter(Presenter):
         self._operator_titles = operator_titles
 
         if self.geojson_file:
-            for coordinate in target_data.coordinates:
-                self._geojson_features.append(coordinate.geojson_feature())
+            self._geojson_features.extend(
+                Coordinate.geojson_features(target_data.coordinates)
+            )
+
+    def _tables(self) -> list[tuple[list[str], CoordinateMatrix]]:
+        """
+        Stations and coordinates of the source, each step and the target.
+        """
+        if self._coordinates is None or self._target_coordinates is None:
+            return []
+
+        tables = [(self._stations, matrix) for matrix in self._coordinates]
+        tables.append((self._target_stations, self._target_coordinates))
+
+        return tables
+
+    def _steps(self) -> list[dict[str, list[float | None]]]:
+        """
+        Coordinates of the source, each step and the target, keyed by station.
+        """
+        return [
+            _coordinates_by_station(matrix, stations)
+            for stations, matrix in self._tables()
+        ]
 
     def as_json(self) -> str:
-        return json.dumps(self._steps)
+        if self._json_cache is None:
+            self._json_cache = json.dumps(self._steps())
+
+        return self._json_cache
+
+    def as_jsonable(self) -> list[dict[str, list[float | None]]]:
+        return self._steps()
 
     def create_json_file(self) -> None:
         """Output data as a JSON-file"""
         if self.json_file:
             with open(self.json_file, "w", encoding="utf-8") as f:
-                json.dump(self._steps, f)
+                json.dump(self._steps(), f)
 
     def create_geojson_file(self) -> None:
         """Output data as a GeoJSON-file."""
@@ -116,14 +250,15 @@ class CoordinatePresenter(Presenter):
             return None
 
         # prepare data structure
+        steps = self._steps()
         for feature in self._geojson_features:
             key = feature["properties"]["station"]
-            for i, step in enumerate(self._steps):
+            for i, step in enumerate(steps):
                 x, y, z, _ = step[key]
                 postfix = str(i)
                 if i == 0:
                     postfix = "source"
-                if i == len(self._steps) - 1:
+                if i == len(steps) - 1:
                     postfix = "target"
 
                 feature["properties"][f"x_{postfix}"] = x
@@ -141,31 +276,39 @@ class CoordinatePresenter(Presenter):
         return None
 
     def as_markdown(self) -> str:
-        fmt = ".4f"
+        if self._markdown_cache is not None:
+            return self._markdown_cache
+
         header = ["Station", "x", "y", "z", "t"]
 
-        text = "Source and target coordinates as well as "
-        text += "intermediate results shown in tabular form.\n\n"
+        # The text is collected in a list of parts, that are joined in the end
+        parts = [
+            "Source and target coordinates as well as "
+            "intermediate results shown in tabular form.\n\n"
+        ]
 
-        for i, step in enumerate(self._steps):
+        tables = self._tables()
+        for i, (stations, matrix) in enumerate(tables):
             if i == 0:
                 stepname = "Source coordinates"
-            elif i < len(self._steps) - 1:
+            elif i < len(tables) - 1:
                 stepname = f"Step {i}: {self._operator_titles[i-1]}"
             else:
                 stepname = "Target coordinates"
 
-            text += f"### {stepname}\n\n"
-            rows = []
-            for station, coordinate in step.items():
-                row = [station, *[format(c, fmt) for c in coordinate]]
-                rows.append(row)
-
+            # all coordinates of a step are formatted in one go
+            formatted = np.char.mod(_COORDINATE_FORMAT, matrix).tolist()
+            rows = [
+                [station, *coordinate]
+                for station, coordinate in zip(stations, formatted)
+            ]
             table = construct_markdown_table(header, rows)
 
-            text += f"{table}\n\n"
+            parts.append(f"### {stepname}\n\n{table}\n\n")
+
+        self._markdown_cache = "".join(parts).rstrip()
 
-        return text.rstrip()
+        return self._markdown_cache
 
 
 class ResidualPresenter(Presenter):
@@ -195,7 +338,16 @@ class ResidualPresenter(Presenter):
             "+proj=cart +ellps=GRS80 +inv"
         )
 
-        self._data: dict = {}
+        # residuals are stored with a row per unique station, holding the
+        # residual components and norms. Statistics have a row per measure.
+        self._stations: list[str] = []
+        self._residuals: Matrix | None = None
+        self._stats: Matrix | None = None
+
+        # JSON and markdown output is created on first request and reused
+        # until new results are evaluated
+        self._json_cache: str | None = None
+        self._markdown_cache: str | None = None
 
     def evaluate(
         self,
@@ -208,47 +360,53 @@ class ResidualPresenter(Presenter):
         Residuals between the target coordinates and coordinates from final step of
         pipeline.
         """
+        # new results make previously created output obsolete
+        self._json_cache = None
+        self._markdown_cache = None
+
         stations = results[0].stations
         target = target_data.coordinate_matrix
         model = results[-1].coordinate_matrix
 
-        residuals = np.subtract(target[:, 0:3], model[:, 0:3])
+        residuals = target[:, 0:3] - model[:, 0:3]
 
         # convert to milimeters
         residuals *= 1000
 
-        residual_norms = [np.linalg.norm(r) for r in residuals]
+        residual_norms = _row_norms(residuals)
 
-        self._data["residuals"] = {}
-        for station, residual, norm in zip(stations, residuals, residual_norms):
-            self._data["residuals"][station] = list(residual) + [norm]
+        table = np.column_stack((residuals, residual_norms))
+        self._stats = _residual_statistics(table)
 
-        self._data["stats"] = {}
-        self._data["stats"]["avg"] = list(np.mean(residuals, axis=0)) + [
-            np.mean(residual_norms)
-        ]
-        self._data["stats"]["std"] = list(np.std(residuals, axis=0)) + [
-            np.std(residual_norms)
-        ]
+        # repeated stations are presented once, statistics include them all
+        self._stations, rows = _unique_station_rows(stations)
+        self._residuals = table[rows]
 
         if self.geojson_file:
             transformer = None
             if self.coordinate_type == CoordinateType.CARTESIAN:
                 transformer = self._cart_transformer_inv
 
-            for coordinate in target_data.coordinates:
-                self._geojson_features.append(
-                    coordinate.geojson_feature(transformer=transformer)
+            self._geojson_features.extend(
+                Coordinate.geojson_features(
+                    target_data.coordinates, transformer=transformer
                 )
+            )
 
     def as_json(self) -> str:
-        return json.dumps(self._data)
+        if self._json_cache is None:
+            self._json_cache = json.dumps(self.as_jsonable())
+
+        return self._json_cache
+
+    def as_jsonable(self) -> dict:
+        return _residuals_as_jsonable(self._stations, self._residuals, self._stats)
 
     def create_json_file(self) -> None:
         """Output data as a JSON-file"""
         if self.json_file:
             with open(self.json_file, "w", encoding="utf-8") as f:
-                json.dump(self._data, f)
+                json.dump(self.as_jsonable(), f)
 
     def create_geojson_file(self) -> None:
         """Output data as a GeoJSON-file."""
@@ -256,10 +414,14 @@ class ResidualPresenter(Presenter):
         if not self.geojson_file:
             return None
 
+        residuals = _residuals_as_jsonable(
+            self._stations, self._residuals, self._stats
+        ).get("residuals", {})
+
         # prepare data structure
         for feature in self._geojson_features:
             key = feature["properties"]["station"]
-            x, y, z, norm = self._data["residuals"][key]
+            x, y, z, norm = residuals[key]
 
             feature["properties"]["residual_x"] = x
             feature["properties"]["residual_y"] = y
@@ -275,35 +437,30 @@ class ResidualPresenter(Presenter):
             json.dump(geojson, f)
 
     def as_markdown(self) -> str:
-        fmt = "< 10.3g"  # three significant figures, could potentially be an option
+        if self._markdown_cache is not None:
+            return self._markdown_cache
 
         header = ["Station", "Rx", "Ry", "Rz", "Norm"]
-        rows = []
-        for station, residuals in self._data["residuals"].items():
-            row = [station, *[format(r, fmt) for r in residuals]]
-            rows.append(row)
+        rows = _formatted_rows(self._stations, self._residuals, _RESIDUAL_FORMAT)
 
-        text = (
+        # The text is collected in a list of parts, that are joined in the end
+        parts = [
             "### Station coordinate residuals\n\n"
             "Residuals of the modelled coordinates as compared to "
             "target cooordinates. The table contains simple "
             "differences of the individual coordinate components "
-            "as well as the length (norm) of the residual vector.\n\n"
-        )
-        text += construct_markdown_table(header, rows)
-
-        text += "\n\n### Residual statistics\n"
+            "as well as the length (norm) of the residual vector.\n\n",
+            construct_markdown_table(header, rows),
+            "\n\n### Residual statistics\n\n",
+        ]
 
         header = ["Measure", "Rx", "Ry", "Rz", "Norm"]
-        rows = []
-        for measure, values in self._data["stats"].items():
-            row = [measure, *[format(v, fmt) for v in values]]
-            rows.append(row)
+        rows = _formatted_rows(_RESIDUAL_STATISTICS, self._stats, _RESIDUAL_FORMAT)
 
-        text += "\n"
-        text += construct_markdown_table(header, rows)
+        parts.append(construct_markdown_table(header, rows))
+        self._markdown_cache = "".join(parts)
 
-        return text
+        return self._markdown_cache
 
 
 class TopocentricResidualPresenter(Presenter):
@@ -339,7 +496,16 @@ class TopocentricResidualPresenter(Presenter):
             _raise_exception_if_file_cant_be_created(self.geojson_file)
             self._geojson_features: list[dict] = []
 
-        self._data: dict = {}
+        # residuals are stored with a row per unique station, holding the
+        # residual components and norms. Statistics have a row per measure.
+        self._stations: list[str] = []
+        self._residuals: Matrix | None = None
+        self._stats: Matrix | None = None
+
+        # JSON and markdown output is created on first request and reused
+        # until new results are evaluated
+        self._json_cache: str | None = None
+        self._markdown_cache: str | None = None
 
         # set up degrees -> cartesian converter
         self._cart_transformer = Transformer.from_projstring("+proj=cart +ellps=GRS80")
@@ -358,6 +524,10 @@ class TopocentricResidualPresenter(Presenter):
         Residuals between the target coordinates and coordinates from final step of
         pipeline.
         """
+        # new results make previously created output obsolete
+        self._json_cache = None
+        self._markdown_cache = None
+
         stations = results[0].stations
         target = target_data.coordinate_matrix
         model = results[-1].coordinate_matrix
@@ -379,44 +549,44 @@ class TopocentricResidualPresenter(Presenter):
                 pipeline = f"+proj=topocentric +ellps=GRS80 +X_0={m[0]} +Y_0={m[1]} +Z_0={m[2]}"
                 enu_diffs = Transformer.from_projstring(pipeline).transform_one(t)
                 templist.append(np.array(enu_diffs))
-                residuals = np.array(templist)
+            residuals = np.array(templist)
 
         if self.coordinate_type == CoordinateType.PROJECTED:
-            residuals = np.subtract(target, model)
+            residuals = target - model
 
         # convert residual values to mm
         residuals *= 1000
 
         # calculate norms, results in mm
-        norms_2d = [np.linalg.norm((r[0], r[1])) for r in residuals]
-        norms_3d = [np.linalg.norm(r) for r in residuals]
-
-        self._data["residuals"] = {}
-        for station, residual, norm2d, norm3d in zip(
-            stations, residuals, norms_2d, norms_3d
-        ):
-            self._data["residuals"][station] = list(residual) + [norm2d] + [norm3d]
-
-        self._data["stats"] = {}
-        self._data["stats"]["avg"] = (
-            list(np.mean(residuals, axis=0)) + [np.mean(norms_2d)] + [np.mean(norms_3d)]
-        )
-        self._data["stats"]["std"] = (
-            list(np.std(residuals, axis=0)) + [np.std(norms_2d)] + [np.mean(norms_3d)]
-        )
+        norms_2d = _row_norms(residuals[:, 0:2])
+        norms_3d = _row_norms(residuals)
+
+        table = np.column_stack((residuals, norms_2d, norms_3d))
+        self._stats = _residual_statistics(table)
+
+        # repeated stations are presented once, statistics include them all
+        self._stations, rows = _unique_station_rows(stations)
+        self._residuals = table[rows]
 
         if self.geojson_file:
             transformer = None
             if self.coordinate_type == CoordinateType.CARTESIAN:
                 transformer = self._cart_transformer_inv
 
-            for coordinate in target_data.coordinates:
-                self._geojson_features.append(
-                    coordinate.geojson_feature(transformer=transformer)
+            self._geojson_features.extend(
+                Coordinate.geojson_features(
+                    target_data.coordinates, transformer=transformer
                 )
+            )
 
     def as_json(self) -> str:
-        return json.dumps(self._data)
+        if self._json_cache is None:
+            self._json_cache = json.dumps(self.as_jsonable())
+
+        return self._json_cache
+
+    def as_jsonable(self) -> dict:
+        return _residuals_as_jsonable(self._stations, self._residuals, self._stats)
 
     def create_json_file(self) -> None:
         """Output data as a JSON-file"""
@@ -424,7 +594,7 @@ class TopocentricResidualPresenter(Presenter):
             return None
 
         with open(self.json_file, "w", encoding="utf-8") as f:
-            json.dump(self._data, f)
+            json.dump(self.as_jsonable(), f)
 
     def create_geojson_file(self) -> None:
         """Output data as a GeoJSON-file."""
@@ -432,10 +602,14 @@ class TopocentricResidualPresenter(Presenter):
         if not self.geojson_file:
             return None
 
+        residuals = _residuals_as_jsonable(
+            self._stations, self._residuals, self._stats
+        ).get("residuals", {})
+
         # prepare data structure
         for feature in self._geojson_features:
             key = feature["properties"]["station"]
-            e, n, u, norm_2d, norm_3d = self._data["residuals"][key]
+            e, n, u, norm_2d, norm_3d = residuals[key]
 
             feature["properties"]["residual_n"] = n
             feature["properties"]["residual_e"] = e
@@ -452,33 +626,28 @@ class TopocentricResidualPresenter(Presenter):
             json.dump(geojson, f)
 
     def as_markdown(self) -> str:
-        fmt = "< 10.3g"  # three significant figures, could potentially be an option
+        if self._markdown_cache is not None:
+            return self._markdown_cache
 
         header = ["Station", "East", "North", "Up", "Planar residual", "Total residual"]
-        rows = []
-        for station, residuals in self._data["residuals"].items():
-            row = [station, *[format(r, fmt) for r in residuals]]
-            rows.append(row)
+        rows = _formatted_rows(self._stations, self._residuals, _RESIDUAL_FORMAT)
 
-        text = (
+        # The text is collected in a list of parts, that are joined in the end
+        parts = [
             "### Station coordinate residuals\n\n"
             "Residuals in topocentric space of the modelled coordinates as "
             "compared to target cooordinates. The table contains coordinate "
             "differences of the individual coordinate components "
             "as well as the length (norm) of the residual vector, "
-            "both in the plane and across all dimensions.\n\n"
-        )
-        text += construct_markdown_table(header, rows)
-
-        text += "\n\n### Residual statistics\n"
+            "both in the plane and across all dimensions.\n\n",
+            construct_markdown_table(header, rows),
+            "\n\n### Residual statistics\n\n",
+        ]
 
         header = ["Measure", "East", "North", "Up", "Planar residual", "Total residual"]
-        rows = []
-        for measure, values in self._data["stats"].items():
-            row = [measure, *[format(v, fmt) for v in values]]
-            rows.append(row)
+        rows = _formatted_rows(_RESIDUAL_STATISTICS, self._stats, _RESIDUAL_FORMAT)
 
-        text += "\n"
-        text += construct_markdown_table(header, rows)
+        parts.append(construct_markdown_table(header, rows))
+        self._markdown_cache = "".join(parts)
 
-        return text
+        return self._markdown_cache
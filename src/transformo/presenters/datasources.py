@@ -47,6 +47,9 @@ class DatasourcePresenter(Presenter):
     def as_json(self):
         return json.dumps(self._data)
 
+    def as_jsonable(self):
+        return self._data
+
     def as_markdown(self):
         sources = yaml.dump(self._data["source_data"], sort_keys=False)
         targets = yaml.dump(self._data["target_data"], sort_keys=False)
@@ -26,6 +26,10 @@ class PROJPresenter(Presenter):
 
         self._output: dict[str, str] = {}
 
+        # The output only changes in `evaluate()`, where the JSON representation
+        # is updated accordingly
+        self._json_cache = json.dumps(self._output)
+
     def evaluate(
         self,
         operators: list[Operator],
@@ -43,23 +47,24 @@ class PROJPresenter(Presenter):
             if operator.proj_operation_name == "noop":
                 continue
 
-            projstr = f"+proj={operator.proj_operation_name}"
-            for param in operator.parameters:
-                projstr += f" {param.as_proj_param}"
+            projstr = " ".join(
+                [f"+proj={operator.proj_operation_name}"]
+                + [param.as_proj_param for param in operator.parameters]
+            )
 
             # if `projstr` is a PROJ pipeline definition we need to manipulate
             # it a bit to avoid nested pipelines (which is not allowed in PROJ)
             steps.append(projstr.removeprefix("+proj=pipeline +step").lstrip())
 
         if len(steps) == 0:
-            self._output["projstring"] = "+proj=noop"
-            return
-
-        if len(steps) == 1:
-            self._output["projstring"] = steps[0]
-            return
+            projstring = "+proj=noop"
+        elif len(steps) == 1:
+            projstring = steps[0]
+        else:
+            projstring = "+proj=pipeline +step " + " +step ".join(steps)
 
-        self._output["projstring"] = "+proj=pipeline +step " + " +step ".join(steps)
+        self._output["projstring"] = projstring
+        self._json_cache = json.dumps(self._output)
 
     def as_json(self) -> str:
         """
@@ -67,13 +72,16 @@ class PROJPresenter(Presenter):
 
         Use the key "projstring" to access the PROJstring.
         """
-        return json.dumps(self._output)
+        return self._json_cache
+
+    def as_jsonable(self) -> dict[str, str]:
+        return dict(self._output)
 
     def as_markdown(self) -> str:
         """Return PROJstring as text."""
-        params = json.loads(self.as_json())
-        txt = params["projstring"]
-        formatted_projstring = txt.replace(" +step", "\n  +step").strip()
+        formatted_projstring = (
+            self._output["projstring"].replace(" +step", "\n  +step").strip()
+        )
 
         markdown = f"""
 Transformation parameters given as a [PROJ](https://proj.org/) string.
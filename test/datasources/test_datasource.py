@@ -2,7 +2,8 @@
 Test built-in datasources.
 """
 
-from typing import Callable
+import gc
+from typing import Callable, Literal
 
 import numpy as np
 import pytest
@@ -66,6 +67,13 @@ def test_datasource_update_coordinates(datasource: DataSource) -> None:
     with pytest.raises(ValueError):
         datasource.update_coordinates(too_many_coordiantes)
 
+    # failed transformations can result in inf's and NaN's
+    for invalid_value in (np.inf, np.nan):
+        invalid_coordinates = np.ones((n, 3))
+        invalid_coordinates[-1, 1] = invalid_value
+        with pytest.raises(ValueError):
+            datasource.update_coordinates(invalid_coordinates)
+
 
 def test_datasource_sum(datasource_factory: DataSource) -> None:
     """
@@ -90,6 +98,30 @@ def test_datasource_sum(datasource_factory: DataSource) -> None:
     assert len(sum_ds.coordinates) == len(ds1.coordinates) + len(ds2.coordinates)
 
 
+def test_datasource_concat(datasource_factory: DataSource) -> None:
+    """
+    Test DataSource.concat.
+
+    Combining a list of DataSource's should give the same result as
+    adding them together.
+    """
+    ds1 = datasource_factory()
+    ds2 = datasource_factory()
+    ds3 = datasource_factory()
+
+    assert not DataSource.concat([]).coordinates
+    assert not DataSource.concat([DataSource(None), DataSource(None)]).coordinates
+    assert DataSource.concat([DataSource(None), ds1]) is ds1
+
+    combined = DataSource.concat([ds1, DataSource(None), ds2, ds3])
+    assert isinstance(combined, CombinedDataSource)
+    assert combined.coordinates == (ds1 + ds2 + ds3).coordinates
+    assert combined.stations == sorted(combined.stations)
+
+    assert len(combined.origins) == 3
+    assert ds2 in combined.origins
+
+
 def test_combineddatasource(datasource_factory: DataSource) -> None:
     """
     Test mechanincs of CombinedDataSource.
@@ -108,6 +140,9 @@ def test_combineddatasource(datasource_factory: DataSource) -> None:
     assert isinstance(combined2, CombinedDataSource)
     assert len(combined2.coordinates) == 3 * n_coords
 
+    combined3 = CombinedDataSource(first, second, datasource_factory())
+    assert len(combined3.coordinates) == 3 * n_coords
+
 
 def test_datasource_origins(datasource_factory: DataSource) -> None:
     """
@@ -146,6 +181,35 @@ def test_datasource_origins(datasource_factory: DataSource) -> None:
     assert len(level4.origins) == 4
 
 
+def test_datasource_get_subclasses() -> None:
+    """
+    Test that subclasses of DataSource are registered in `get_subclasses()`.
+    """
+    subclasses = DataSource.get_subclasses()
+
+    assert DataSource in subclasses
+    assert CombinedDataSource in subclasses
+    assert CsvDataSource in subclasses
+    assert len(subclasses) == len(set(subclasses))
+
+    # subclasses of subclasses are found as well
+    class ChildDataSource(CsvDataSource):
+        """Subclass of a subclass of DataSource."""
+
+        type: Literal["child_datasource"] = "child_datasource"
+
+    assert ChildDataSource in DataSource.get_subclasses()
+    assert ChildDataSource in CsvDataSource.get_subclasses()
+    assert CombinedDataSource not in CsvDataSource.get_subclasses()
+
+    # subclasses that are no longer referenced are not kept registered
+    del ChildDataSource
+    gc.collect()
+
+    subclasses = DataSource.get_subclasses()
+    assert "ChildDataSource" not in [subclass.__name__ for subclass in subclasses]
+
+
 def test_datasource_hash(files) -> None:
     """
     Test DataSource.__hash__()
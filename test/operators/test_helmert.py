@@ -7,6 +7,7 @@ import pytest
 
 from transformo.datatypes import Parameter
 from transformo.operators import Helmert7Param, HelmertTranslation, RotationConvention
+from transformo.operators.helmert import R1, R2, R3, R321
 from transformo.transformer import Transformer
 
 
@@ -21,6 +22,11 @@ def test_helmerttranslation_can_estimate():
     assert np.sum(helmert_with_no_parameters.T) == 0.0
     assert helmert_with_no_parameters._transformation_parameters_given is False
 
+    # NaN's are treated as parameters that have not been given
+    helmert_with_nan_parameter = HelmertTranslation(x=float("nan"))
+    assert helmert_with_nan_parameter.can_estimate is True
+    assert np.all(helmert_with_nan_parameter.T == 0.0)
+
     helmert_with_one_parameter = HelmertTranslation(name="anything_really", y=5.0)
     assert helmert_with_one_parameter.can_estimate is False
 
@@ -48,6 +54,11 @@ def test_helmerttranslation_as_estimator():
     # source and target coordinates we can easily predict result
     assert np.prod(helmert_with_no_parameters.T) == 1
 
+    # Without weights a plain average is used
+    helmert_without_weights = HelmertTranslation()
+    helmert_without_weights.estimate(source_coordinates, target_coordinates, None, None)
+    assert np.all(helmert_without_weights.T == helmert_with_no_parameters.T)
+
 
 def test_helmerttranslation_estimation_with_weights():
     """
@@ -92,6 +103,15 @@ def test_helmerttranslation_estimation_with_weights():
     assert helmert.T[1] == -(100 * 0.5 + 50 + 50) / (0.5 + 1 + 1)
     assert helmert.T[2] == -(50 + 50) / 2
 
+    # weights that sum to zero can't be used to determine an average
+    with pytest.raises(ZeroDivisionError):
+        helmert.estimate(
+            source_coordinates,
+            target_coordinates,
+            np.zeros(shape=(3, 3)),
+            target_weights,
+        )
+
 
 def test_helmerttranslation_as_operator():
     """
@@ -107,12 +127,36 @@ def test_helmerttranslation_as_operator():
     print(roundtripped_coordinates)
     assert np.all(source_coordinates == roundtripped_coordinates)
 
+    # results can be written to a preallocated matrix, or in place
+    out = np.empty_like(source_coordinates)
+    result = op.forward(source_coordinates, out=out)
+    assert result is out
+    assert np.all(out[:, 0:3] == op.T)
+    assert np.all(source_coordinates == 0.0)
+
+    result = op.inverse(out, out=out)
+    assert result is out
+    assert np.all(out == source_coordinates)
+
+    # coordinates can be transformed in place, without any copies
+    coordinates = np.ones(shape=(10, 4))
+    assert op.forward(coordinates, out=coordinates) is coordinates
+    assert np.all(coordinates[:, 0:3] == op.T + 1)
+    assert np.all(coordinates[:, 3] == 1)
+
     # does the `Operator.parameters` property work as expected?
     assert len(op.parameters) == 3
     assert op.parameters[0] == Parameter("x", 3)
     assert op.parameters[1] == Parameter("y", 5)
     assert op.parameters[2] == Parameter("z", 10)
 
+    assert op.proj_operation_name == "helmert"
+    assert HelmertTranslation().proj_operation_name == "noop"
+    assert (
+        Helmert7Param(convention=RotationConvention.POSITION_VECTOR).proj_operation_name
+        == "helmert"
+    )
+
 
 def test_helmert7param_instantiation():
     """
@@ -233,6 +277,91 @@ def test_helmert7param_transformation(source_coordinates):
     assert np.allclose(source_coordinates, roundtrip)
 
 
+def test_helmert7param_without_rotations(source_coordinates):
+    """
+    Test that Helmert7Param without rotations match a general transformation.
+    """
+    h7 = Helmert7Param(
+        convention=RotationConvention.POSITION_VECTOR,
+        x=1234.0,
+        y=923.0,
+        z=523.0,
+        s=0.005,
+    )
+
+    expected = h7.T + h7.scale * source_coordinates[:, 0:3] @ h7.R.T
+    transformed = h7.forward(source_coordinates)
+
+    assert np.allclose(transformed[:, 0:3], expected)
+    assert np.all(transformed[:, 3] == source_coordinates[:, 3])
+    assert np.allclose(h7.inverse(transformed), source_coordinates)
+
+
+def test_helmert7param_single_precision(source_coordinates):
+    """
+    Test that single precision coordinates stay in single precision.
+    """
+    h7 = Helmert7Param(
+        convention=RotationConvention.POSITION_VECTOR,
+        x=1234.0,
+        y=923.0,
+        z=523.0,
+        rx=0.001,
+        s=0.005,
+    )
+
+    coordinates = source_coordinates.astype(np.float32)
+    transformed = h7.forward(coordinates)
+
+    assert transformed.dtype == np.float32
+    assert np.allclose(transformed, h7.forward(source_coordinates))
+    assert h7.inverse(transformed).dtype == np.float32
+
+
+@pytest.mark.parametrize("small_angle_approximation", [True, False])
+@pytest.mark.parametrize(
+    "convention",
+    [RotationConvention.POSITION_VECTOR, RotationConvention.COORDINATE_FRAME],
+)
+def test_helmert7param_compose(
+    source_coordinates, convention, small_angle_approximation
+):
+    """
+    Test that a composed Helmert matches applying two Helmerts in sequence.
+    """
+    first = Helmert7Param(
+        convention=convention,
+        small_angle_approximation=small_angle_approximation,
+        x=1234.0,
+        y=923.0,
+        z=523.0,
+        rx=0.001,
+        ry=0.002,
+        rz=0.003,
+        s=0.005,
+    )
+    second = Helmert7Param(
+        convention=convention,
+        small_angle_approximation=small_angle_approximation,
+        x=-34.0,
+        y=2.0,
+        z=110.0,
+        rx=-0.021,
+        ry=0.012,
+        rz=0.0051,
+        s=-0.015,
+    )
+
+    combined = first.compose(second)
+    assert combined.convention == convention
+    assert combined.small_angle_approximation == small_angle_approximation
+
+    expected = second.forward(first.forward(source_coordinates))
+    assert np.allclose(
+        combined.forward(source_coordinates), expected, rtol=0, atol=1e-6
+    )
+
+
 def test_helmert7param_small_angle_approximation():
     """
     Test the rotation matrix with and without the small angles approximation.
@@ -282,6 +411,15 @@ def test_helmert7param_small_angle_approximation():
     assert x_rotation.R[2][1] != arcsec2rad(rx)
 
 
+def test_combined_rotation_matrix():
+    """
+    Test that the closed-form rotation matrix matches the combined rotations.
+    """
+    rx, ry, rz = 0.1, -0.2, 0.3
+
+    assert np.allclose(R321(rx, ry, rz), R3(rz) @ R2(ry) @ R1(rx))
+
+
 def test_helmert7parameter_estimation(source_coordinates, target_coordinates):
     """
     Verify that estimation of a 7 parameter Helmert works.
@@ -298,7 +436,10 @@ def test_helmert7parameter_estimation(source_coordinates, target_coordinates):
     # we only have weights for the spatial parts of a coordinate
     weights = np.ones((source_coordinates.shape[0], 3))
 
+    # derived values, such as the rotation matrix, are updated after estimation
+    assert np.all(h.R == np.eye(3))
     h.estimate(source_coordinates, target_coordinates, weights, weights)
+    assert not np.all(h.R == np.eye(3))
 
     estimated_coordinates = h.forward(source_coordinates)
 
@@ -311,3 +452,73 @@ def test_helmert7parameter_estimation(source_coordinates, target_coordinates):
     assert estimated_coordinates[-1, 0] == pytest.approx(target_coordinates[-1, 0])
     assert estimated_coordinates[-1, 1] == pytest.approx(target_coordinates[-1, 1])
     assert estimated_coordinates[-1, 2] == pytest.approx(target_coordinates[-1, 2])
+
+
+def test_helmert7parameter_estimation_weights(source_coordinates, target_coordinates):
+    """
+    Verify that weights are applied when estimating a 7 parameter Helmert.
+    """
+    unit_weights = np.ones((source_coordinates.shape[0], 3))
+
+    h_weighted = Helmert7Param(convention=RotationConvention.POSITION_VECTOR)
+    h_weighted.estimate(source_coordinates, target_coordinates, unit_weights, None)
+
+    # without weights all observations are weighted equally
+    h_unweighted = Helmert7Param(convention=RotationConvention.POSITION_VECTOR)
+    h_unweighted.estimate(source_coordinates, target_coordinates, None, None)
+
+    for name in ("x", "y", "z", "s", "rx", "ry", "rz"):
+        assert getattr(h_weighted, name) == pytest.approx(getattr(h_unweighted, name))
+
+    # down-weighting all but the first three stations should pull the
+    # transformation towards those stations
+    weights = np.full((source_coordinates.shape[0], 3), 1e-6)
+    weights[0:3] = 1.0
+    h_skewed = Helmert7Param(convention=RotationConvention.POSITION_VECTOR)
+    h_skewed.estimate(source_coordinates, target_coordinates, weights, None)
+
+    def residual(h: Helmert7Param) -> float:
+        diff = h.forward(source_coordinates)[0:3, 0:3] - target_coordinates[0:3, 0:3]
+        return np.linalg.norm(diff)
+
+    assert residual(h_skewed) <= residual(h_unweighted)
+
+
+def test_helmerttranslation_noop(source_coordinates):
+    """
+    Test that a translation of zero passes coordinates through untouched.
+    """
+    h = HelmertTranslation(x=0, y=0, z=0)
+    assert h.is_noop
+
+    assert h.forward(source_coordinates) is source_coordinates
+    assert h.inverse(source_coordinates) is source_coordinates
+
+    out = np.empty_like(source_coordinates)
+    assert h.forward(source_coordinates, out=out) is out
+    assert np.all(out == source_coordinates)
+
+    # after estimation the translation is no longer zero
+    h.estimate(source_coordinates, source_coordinates + 1, None, None)
+    assert not h.is_noop
+    assert np.allclose(
+        h.forward(source_coordinates)[:, 0:3], source_coordinates[:, 0:3] + 1
+    )
+
+
+def test_helmert7parameter_is_noop():
+    """
+    Test that a 7 parameter Helmert is never treated as a no-op, even when
+    it is instantiated with a translation of zero.
+    """
+    convention = RotationConvention.POSITION_VECTOR
+    coordinates = np.array([[3500000.0, 700000.0, 5200000.0, 2020.0]])
+
+    for helmert in (
+        Helmert7Param(convention=convention),
+        Helmert7Param(convention=convention, rx=1),
+        Helmert7Param(convention=convention, s=1),
+    ):
+        assert not helmert.is_noop
+        assert helmert.forward(coordinates) is not coordinates
+        assert helmert.inverse(coordinates) is not coordinates
@@ -2,6 +2,8 @@
 Test built-in Operator.
 """
 
+import gc
+import threading
 from typing import Literal
 
 import numpy as np
@@ -10,6 +12,7 @@ import pytest
 from transformo._typing import CoordinateMatrix
 from transformo.datatypes import Parameter
 from transformo.operators import DummyOperator, Operator, ProjOperator
+from transformo.operators.proj import _executor
 
 
 def test_base_operator(source_coordinates):
@@ -70,6 +73,28 @@ def test_base_operator(source_coordinates):
     assert operator.can_estimate is False
 
 
+def test_operator_get_subclasses_weak() -> None:
+    """
+    Test that subclasses that are no longer referenced are not kept registered.
+    """
+
+    class TemporaryOperator(Operator):
+        type: Literal["temporary_operator"] = "temporary_operator"
+
+        def forward(
+            self, coordinates: CoordinateMatrix, out: CoordinateMatrix | None = None
+        ) -> CoordinateMatrix:
+            return coordinates
+
+    assert TemporaryOperator in Operator.get_subclasses()
+
+    del TemporaryOperator
+    gc.collect()
+
+    subclasses = Operator.get_subclasses()
+    assert "TemporaryOperator" not in [subclass.__name__ for subclass in subclasses]
+
+
 def test_dummyoperator(source_coordinates, target_coordinates):
     """."""
     operator = DummyOperator(name="captaindumbdumb")
@@ -100,3 +125,111 @@ def test_4d_transformation(source_coordinates):
     dt = source_coordinates[:, 3] - 2000
     x_offset_removed = transformed[:, 0] - dt * 10
     assert np.all(x_offset_removed == source_coordinates[:, 0])
+
+
+def test_operator_out_argument(source_coordinates):
+    """
+    Test that operators can write results to a preallocated matrix.
+    """
+    operators = [
+        DummyOperator(),
+        ProjOperator(proj_string="+proj=helmert +x=10 +y=20 +z=30"),
+    ]
+
+    for op in operators:
+        expected = op.forward(source_coordinates)
+
+        out = np.empty_like(source_coordinates)
+        assert op.forward(source_coordinates, out=out) is out
+        assert np.all(out == expected)
+
+        assert op.inverse(out, out=out) is out
+        assert np.allclose(out, source_coordinates)
+
+
+def test_proj_operator_input_unchanged(source_coordinates):
+    """
+    Test that `ProjOperator` doesn't modify the input coordinates.
+
+    PROJ transforms coordinates in place, so the input has to be kept safe.
+    """
+    original = source_coordinates.copy()
+    op = ProjOperator(proj_string="+proj=helmert +x=10 +y=20 +z=30")
+
+    transformed = op.forward(source_coordinates)
+    assert np.all(source_coordinates == original)
+    assert np.allclose(transformed[:, 0:3], original[:, 0:3] + [10, 20, 30])
+
+    fortran_ordered = np.asfortranarray(original)
+    op.inverse(fortran_ordered)
+    assert np.all(fortran_ordered == original)
+
+
+def test_proj_operator_chunks(source_coordinates, monkeypatch):
+    """
+    Test that `ProjOperator` gives the same results when transforming in chunks.
+    """
+    op = ProjOperator(
+        proj_string="+proj=helmert +x=10 +y=20 +z=30 +rx=1 +convention=position_vector"
+    )
+    expected = op.forward(source_coordinates)
+
+    monkeypatch.setattr(ProjOperator, "CHUNK_SIZE", 3)
+    assert np.all(op.forward(source_coordinates) == expected)
+    assert np.allclose(op.inverse(expected), source_coordinates)
+
+
+def test_proj_operator_threads(source_coordinates, monkeypatch):
+    """
+    Test that `ProjOperator` gives the same results when chunks are
+    transformed in parallel.
+    """
+    op = ProjOperator(
+        proj_string="+proj=helmert +x=10 +y=20 +z=30 +rx=1 +convention=position_vector"
+    )
+    expected = op.forward(source_coordinates)
+
+    thread_names = set()
+    transform_chunk = ProjOperator._transform_chunk
+
+    def recording_transform_chunk(self, chunk, direction):
+        thread_names.add(threading.current_thread().name)
+        transform_chunk(self, chunk, direction)
+
+    monkeypatch.setattr(ProjOperator, "CHUNK_SIZE", 3)
+    monkeypatch.setattr(ProjOperator, "_transform_chunk", recording_transform_chunk)
+    monkeypatch.setattr("transformo.operators.proj._usable_cpu_count", lambda: 4)
+    assert np.all(op.forward(source_coordinates) == expected)
+    assert np.allclose(op.inverse(expected), source_coordinates)
+
+    # chunks are transformed by the threads of the persistent, shared pool
+    assert thread_names
+    assert all(name.startswith("transformo-proj") for name in thread_names)
+    assert _executor() is _executor()
+
+
+def test_proj_operator_shares_transformer():
+    """
+    Test that `ProjOperator`s with the same PROJ string share a transformer.
+    """
+    op1 = ProjOperator(proj_string="+proj=helmert +x=10 +y=20 +z=30")
+    op2 = ProjOperator(proj_string="+proj=helmert +x=10 +y=20 +z=30")
+    op3 = ProjOperator(proj_string="+proj=helmert +x=10 +y=20 +z=31")
+
+    assert op1._transformer is op2._transformer
+    assert op1._transformer is not op3._transformer
+
+
+def test_operator_is_noop():
+    """
+    Test the `Operator.is_noop` property.
+    """
+    assert DummyOperator().is_noop
+
+    noop = ProjOperator(proj_string="+proj=noop")
+    assert noop.proj_operation_name == "noop"
+    assert noop.is_noop
+
+    helmert = ProjOperator(proj_string="+proj=helmert +x=10")
+    assert helmert.proj_operation_name == "helmert"
+    assert not helmert.is_noop
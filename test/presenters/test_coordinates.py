@@ -4,6 +4,9 @@ Tests for transformo.presenters.coordinates
 
 import json
 
+import numpy as np
+import pytest
+
 from transformo._typing import GeoJSONFileCreator, JSONFileCreator
 from transformo.datasources import CsvDataSource, DataSource
 from transformo.datatypes import Coordinate
@@ -56,6 +59,7 @@ def test_coordinate_presenter(tmp_path, files, dummy_operator):
         results=[ds1],  # emmulate the dummy operator
     )
     results = json.loads(p.as_json())
+    assert p.as_jsonable() == results
 
     # Does this implement the JSONFileCreator protocol correctly?
     assert isinstance(p, JSONFileCreator)
@@ -136,6 +140,54 @@ Source and target coordinates as well as intermediate results shown in tabular f
     print(p.as_markdown())
     assert expected_text == p.as_markdown()
 
+    # output is reused until new results are evaluated
+    json_output = p.as_json()
+    markdown = p.as_markdown()
+    assert p.as_json() is json_output
+    assert p.as_markdown() is markdown
+
+    p.evaluate(
+        operators=[dummy_operator],
+        source_data=ds2,
+        target_data=ds2,
+        results=[ds2],
+    )
+    assert p.as_json() != json_output
+    assert p.as_markdown() != markdown
+
+    # all steps now hold the target coordinates
+    steps = json.loads(p.as_json())
+    assert steps[0] == steps[1] == steps[2] == results[2]
+    assert p.as_markdown().count(expected_text.split("### Target coordinates")[1]) == 3
+
+
+def test_coordinate_presenter_overlapping_datasources(files, dummy_operator):
+    """
+    Stations that appear in several data sources are only presented once.
+    """
+    ds1 = CsvDataSource(filename=files["dk_cors_itrf2014.csv"])
+    ds2 = CsvDataSource(filename=files["dk_cors_etrs89.csv"])
+    overlapping = ds1 + ds2
+
+    p = CoordinatePresenter()
+    p.evaluate(
+        operators=[dummy_operator],
+        source_data=overlapping,
+        target_data=ds2 + ds2,
+        results=[overlapping],
+    )
+
+    # the last occurrence of a station is presented
+    steps = p.as_jsonable()
+    assert list(steps[0]) == ds2.stations
+    assert steps[0]["BUDP"] == [*ds2.coordinate_matrix[0, 0:3].tolist(), 2018.24]
+    assert steps[0] == steps[1] == steps[2]
+
+    # three tables, each with a header, separator and one row per station
+    table_lines = [line for line in p.as_markdown().splitlines() if line[:1] == "|"]
+    assert len(table_lines) == 3 * (2 + len(ds2.stations))
+    assert p.as_markdown().count("| BUDP ") == 3
+
 
 def test_residual_presenter(tmp_path, dummy_operator):
     """
@@ -187,6 +239,12 @@ def test_residual_presenter(tmp_path, dummy_operator):
 
     assert json_data == presenter.as_json()
 
+    # statistics cover both the residual components and the norms
+    data = presenter.as_jsonable()
+    residuals = np.array(list(data["residuals"].values()))
+    assert data["stats"]["avg"] == pytest.approx(np.mean(residuals, axis=0))
+    assert data["stats"]["std"] == pytest.approx(np.std(residuals, axis=0))
+
     presenter.create_geojson_file()
     with open(geojson_file, "r", encoding="utf-8") as f:
         geojson_data = json.loads(f.read())
@@ -194,6 +252,60 @@ def test_residual_presenter(tmp_path, dummy_operator):
     assert _is_valid_geojson(geojson_data)
     assert len(geojson_data["features"]) == len(model.stations)
 
+    # output is reused until new results are evaluated
+    json_output = presenter.as_json()
+    markdown = presenter.as_markdown()
+    assert presenter.as_json() is json_output
+    assert presenter.as_markdown() is markdown
+
+    presenter.evaluate(
+        operators=[dummy_operator],
+        source_data=model,
+        target_data=model,
+        results=[model],
+    )
+    assert json.loads(presenter.as_json())["residuals"]["A"] == [0.0, 0.0, 0.0, 0.0]
+    assert presenter.as_markdown() != markdown
+
+    # the model is compared with itself so all residuals of station A are zero
+    rows = [
+        [cell.strip() for cell in line.strip("|").split("|")]
+        for line in presenter.as_markdown().splitlines()
+    ]
+    assert ["A", "0", "0", "0", "0"] in rows
+
+
+@pytest.mark.parametrize(
+    "presenter_class", [ResidualPresenter, TopocentricResidualPresenter]
+)
+def test_residual_presenters_overlapping_datasources(
+    files, dummy_operator, presenter_class
+):
+    """
+    Stations that appear in several data sources are only presented once.
+    """
+    model = CsvDataSource(filename=files["dk_cors_itrf2014.csv"])
+    target = CsvDataSource(filename=files["dk_cors_etrs89.csv"])
+
+    presenters = []
+    for source_data, target_data in ((model, target), (model + model, target + target)):
+        presenter = presenter_class(coordinate_type=CoordinateType.CARTESIAN)
+        presenter.evaluate(
+            operators=[dummy_operator],
+            source_data=source_data,
+            target_data=target_data,
+            results=[source_data],
+        )
+        presenters.append(presenter)
+
+    single, overlapping = presenters
+
+    assert list(overlapping.as_jsonable()["residuals"]) == model.stations
+    assert overlapping.as_markdown().count("| BUDP ") == 1
+
+    # repeating every station doesn't change the statistics either
+    assert overlapping.as_markdown() == single.as_markdown()
+
 
 def test_topocentricresidual_presenter_degree(tmp_path):
     """
@@ -237,6 +349,12 @@ def test_topocentricresidual_presenter_degree(tmp_path):
 
     assert json_data == presenter.as_json()
 
+    # statistics cover both the residual components and the norms
+    data = presenter.as_jsonable()
+    residuals = np.array(list(data["residuals"].values()))
+    assert data["stats"]["avg"] == pytest.approx(np.mean(residuals, axis=0))
+    assert data["stats"]["std"] == pytest.approx(np.std(residuals, axis=0))
+
     presenter.create_geojson_file()
     with open(geojson_file, "r", encoding="utf-8") as f:
         geojson_data = json.loads(f.read())
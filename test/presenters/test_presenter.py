@@ -2,13 +2,14 @@
 Tests for Presenter and DummyPresenter
 """
 
+import gc
 from typing import Literal
 
 import pytest
 
 from transformo.datasources import DataSource
 from transformo.operators import Operator
-from transformo.presenters import DummyPresenter, Presenter
+from transformo.presenters import DummyPresenter, Presenter, construct_markdown_table
 
 
 def test_base_presenter():
@@ -48,12 +49,22 @@ def test_base_presenter():
     assert isinstance(operator, Presenter)
     assert isinstance(operator, ChildPresenter)
 
+    # the default JSON-able representation is derived from `as_json()`
+    assert operator.as_jsonable() == {}
+
     # Let's check that children of Presenter is registered properly in the
     # class method `get_subclasses()`.
     subclasses = Presenter.get_subclasses()
     assert Presenter in subclasses
     assert ChildPresenter in subclasses
 
+    # subclasses that are no longer referenced are not kept registered
+    del operator, subclasses, ChildPresenter
+    gc.collect()
+
+    subclasses = Presenter.get_subclasses()
+    assert "ChildPresenter" not in [subclass.__name__ for subclass in subclasses]
+
 
 def test_presenter_name_property():
     """
@@ -64,3 +75,23 @@ def test_presenter_name_property():
 
     presenter_with_name = DummyPresenter(name="The dumb presenter")
     assert presenter_with_name.presenter_name == "The dumb presenter"
+
+
+def test_construct_markdown_table():
+    """
+    Test the layout of tables created with `construct_markdown_table()`.
+    """
+    table = construct_markdown_table(
+        ["Station", "x", "value"],
+        [["AAAA", "1.0", "a"], ["BBBBBB", "22.25", "bb"]],
+    )
+
+    expected = "\n".join(
+        [
+            "|Station |   x   |value|",
+            "|--------|-------|-----|",
+            "|  AAAA  |  1.0  |  a  |",
+            "| BBBBBB | 22.25 | bb  |",
+        ]
+    )
+    assert table == expected
@@ -29,6 +29,7 @@ def test_proj_presenter():
     )
 
     assert presenter_with_no_operators.as_json() == '{"projstring": "+proj=noop"}'
+    assert presenter_with_no_operators.as_jsonable() == {"projstring": "+proj=noop"}
 
     presenter_with_one_operator = PROJPresenter()
     presenter_with_one_operator.evaluate(
@@ -6,7 +6,7 @@ import numpy as np
 import pydantic
 import pytest
 
-from transformo.datatypes import Coordinate, Parameter
+from transformo.datatypes import Coordinate, CoordinateBatch, Parameter
 from transformo.transformer import Transformer
 
 
@@ -124,6 +124,13 @@ def test_coordinate_vector_property(coordinate: Coordinate):
     assert coordinate.vector[2] == coordinate.z
 
     assert isinstance(coordinate.vector, np.ndarray)
+    assert coordinate.vector.dtype == np.float64
+
+    no_timestamp = Coordinate(
+        station="NOTS", x=1.0, y=2.0, z=3.0, sx=0.1, sy=0.2, sz=0.3
+    )
+    assert no_timestamp.vector.dtype == np.float64
+    assert np.isnan(no_timestamp.vector[3])
 
 
 def test_coordinate_weights_property(coordinate: Coordinate):
@@ -178,6 +185,51 @@ def test_coordinate_geojson_feature(coordinate: Coordinate):
     )
 
 
+def test_coordinate_geojson_features(coordinate: Coordinate):
+    """Test that geojson_features matches geojson_feature for each coordinate."""
+
+    other = Coordinate(
+        station="OTHR", x=10.0, y=56.0, z=3.0, sx=0.1, sy=0.2, sz=0.3, t=2020.0
+    )
+    coordinates = [coordinate, other]
+
+    assert Coordinate.geojson_features([]) == []
+    assert Coordinate.geojson_features(coordinates) == [
+        c.geojson_feature() for c in coordinates
+    ]
+
+    transformer = Transformer.from_projstring("+proj=helmert +x=1.0 +y=2.0")
+    assert Coordinate.geojson_features(coordinates, transformer=transformer) == [
+        c.geojson_feature(transformer=transformer) for c in coordinates
+    ]
+
+
+def test_coordinate_batch(coordinate: Coordinate):
+    """Test that a CoordinateBatch stores coordinates element-wise."""
+
+    no_timestamp = Coordinate(
+        station="NOTS", x=1.0, y=2.0, z=3.0, sx=0.1, sy=0.2, sz=0.3, w=2.0
+    )
+    batch = CoordinateBatch.from_coordinates([coordinate, no_timestamp])
+
+    assert len(batch) == 2
+    assert batch.x[0] == coordinate.x
+    assert batch.y[1] == no_timestamp.y
+    assert batch.sz[1] == no_timestamp.sz
+    assert batch.w[1] == no_timestamp.w
+
+    matrix = batch.as_matrix()
+    assert matrix.shape == (2, 4)
+    assert matrix.dtype == np.float64
+    assert np.all(matrix[0] == coordinate.vector)
+    assert np.isnan(matrix[1, 3])
+
+    weights = batch.weights()
+    assert weights.shape == (2, 3)
+    assert np.all(weights[0] == coordinate.weights)
+    assert np.all(weights[1] == no_timestamp.weights)
+
+
 def test_parameter():
     """Test functionality of Parameter"""
 
@@ -33,6 +33,19 @@ def test_pipeline(datasource_factory: Callable) -> None:
     assert pipeline.target_coordinates.shape == (n_coordinates, 4)
 
 
+def test_pipeline_empty() -> None:
+    """
+    Test that a Pipeline can be created without any data, e.g. as a template.
+    """
+    pipeline = Pipeline(source_data=[], target_data=[], operators=[], presenters=[])
+
+    assert pipeline.source_coordinates.shape == (0, 4)
+    assert pipeline.target_coordinates.shape == (0, 4)
+
+    pipeline.process()
+    assert len(pipeline.results) == 0
+
+
 def test_pipeline_yaml_serilization(files: dict) -> None:
     """
     Test YAML serilization of a Pipeline.
@@ -161,6 +174,16 @@ def test_pipeline_access() -> None:
     assert target.coordinates[0].y - results[1].coordinates[0].y == pytest.approx(0)
     assert target.coordinates[0].z - results[1].coordinates[0].z == pytest.approx(0)
 
+    # results of each step are created once and behave like a list
+    assert results[-1] is results[1]
+    assert results[0:2] == [results[0], results[1]]
+    assert list(results) == results[:]
+
+    # processing again shouldn't change anything
+    pipeline.process()
+    assert pipeline.results is results
+    assert len(pipeline.results) == 2
+
 
 def test_pipeline_results_as_markdown(files: dict) -> None:
     """